@@ -19,7 +19,7 @@ if not config.validate():
     logger.error("配置验证失败，请检查环境变量设置")
     raise RuntimeError("配置验证失败")
 
-logger.info("AI-Tool 核心模块初始化完成 - 环境: {config.ENVIRONMENT}")
+logger.info("AI-Tool 核心模块初始化完成 - 环境: %s", config.ENVIRONMENT)
 
 # 导出主要组件
 __all__ = ["config", "logger"]
@@ -5,78 +5,123 @@ AI-Tool 统一配置管理
 
 import logging
 import os
+import re
 from pathlib import Path
-from typing import Any, Dict
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
+
+# 大小字符串解析: "10MB" / "512 kb" / "1024"
+_SIZE_PATTERN = re.compile(r"\s*(\d+)\s*([KMG]?B)?\s*")
+_SIZE_UNITS = {None: 1, "B": 1, "KB": 1 << 10, "MB": 1 << 20, "GB": 1 << 30}
+
+# 日志格式定义与环境变量无关，模块级常量供所有配置实例共享
+# （dictConfig 需要可写的普通 dict，它会复制而不是修改传入的配置）
+_LOG_FORMATTERS: Dict[str, Any] = {
+    "standard": {"format": "%(asctime)s [%(levelname)s] %(name)s: %(message)s"},
+    "detailed": {
+        "format": "%(asctime)s [%(levelname)s] %(name)s:%(lineno)d: %(message)s"
+    },
+}
+
+
+def _to_bool(value: Any) -> bool:
+    """将环境变量值解析为布尔值"""
+    return str(value).strip().lower() in {"1", "true", "yes", "on"}
 
 
 class Config:
     """统一配置管理类"""
 
+    # 环境变量配置表: (变量名, 类型转换函数, 默认值)
+    _SCHEMA = (
+        # 日志配置
+        ("LOG_LEVEL", str, "INFO"),
+        ("LOG_MAX_SIZE", str, "10MB"),
+        ("LOG_BACKUP_COUNT", int, 5),
+        # MCP服务器配置
+        ("MCP_HOST", str, "localhost"),
+        ("MCP_PORT", int, 8000),
+        ("MCP_MAX_INSTANCES", int, 10),
+        ("MCP_INSTANCE_TIMEOUT", int, 30),
+        # 文件操作配置
+        ("MAX_FILE_SIZE", int, 100),  # MB
+        ("MAX_CONCURRENT_FILES", int, 5),
+        ("DEFAULT_TIMEOUT", int, 30),
+        ("MAX_RETRY_COUNT", int, 3),
+        # 安全配置
+        ("ALLOW_LOCALHOST", _to_bool, False),
+        ("ALLOW_PRIVATE_IPS", _to_bool, False),
+        ("ADMIN_REQUIRED", _to_bool, True),
+        # 系统监控配置
+        ("MONITOR_INTERVAL", int, 5),  # 秒
+        ("CPU_THRESHOLD", float, 80.0),  # %
+        ("MEMORY_THRESHOLD", float, 80.0),  # %
+        # 下载配置
+        ("RATE_LIMIT_MB_PER_SEC", float, 0.0),
+        ("DOWNLOAD_CHUNK_SIZE", int, 256 * 1024),  # 字节
+        # 环境配置
+        ("ENVIRONMENT", str, "development"),
+        ("DEBUG", _to_bool, False),
+    )
+
+    # 固定属性布局：配置表中的变量 + 路径及派生属性
+    __slots__ = tuple(name for name, _, _ in _SCHEMA) + (
+        "PROJECT_ROOT",
+        "LOG_DIR",
+        "CONFIG_DIR",
+        "LOG_FILE",
+        "LOG_MAX_BYTES",
+        "DOWNLOAD_DIR",
+        "_log_dir_ready",
+        "_log_config",
+        "_dict_cache",
+    )
+
     def __init__(self):
         # 基础配置
         self.PROJECT_ROOT = Path(__file__).parent.parent
         self.LOG_DIR = self.PROJECT_ROOT / "logs"
         self.CONFIG_DIR = self.PROJECT_ROOT / "config"
 
-        # 确保目录存在
-        self.LOG_DIR.mkdir(exist_ok=True)
-        # self.CONFIG_DIR.mkdir(exist_ok=True)  # 暂时不需要config目录
+        # 日志目录在首次生成日志配置时才创建
+        self._log_dir_ready = False
 
-        # 日志配置
-        self.LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-        self.LOG_FILE = os.getenv("LOG_FILE", str(self.LOG_DIR / "ai-tool.log"))
-        self.LOG_MAX_SIZE = os.getenv("LOG_MAX_SIZE", "10MB")
-        self.LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+        # 派生配置缓存（配置初始化后不再变化，首次访问时生成）
+        self._log_config: Optional[Mapping[str, Any]] = None
+        self._dict_cache: Optional[Dict[str, Any]] = None
 
-        # MCP服务器配置
-        self.MCP_HOST = os.getenv("MCP_HOST", "localhost")
-        self.MCP_PORT = int(os.getenv("MCP_PORT", "8000"))
-        self.MCP_MAX_INSTANCES = int(os.getenv("MCP_MAX_INSTANCES", "10"))
-        self.MCP_INSTANCE_TIMEOUT = int(os.getenv("MCP_INSTANCE_TIMEOUT", "30"))
+        env = os.environ.get
 
-        # 文件操作配置
-        self.MAX_FILE_SIZE = int(os.getenv("MAX_FILE_SIZE", "100"))  # MB
-        self.MAX_CONCURRENT_FILES = int(os.getenv("MAX_CONCURRENT_FILES", "5"))
-        self.DEFAULT_TIMEOUT = int(os.getenv("DEFAULT_TIMEOUT", "30"))
-        self.MAX_RETRY_COUNT = int(os.getenv("MAX_RETRY_COUNT", "3"))
+        # 依赖项目路径的默认值
+        self.LOG_FILE = env("LOG_FILE", str(self.LOG_DIR / "ai-tool.log"))
+        self.DOWNLOAD_DIR = env("DOWNLOAD_DIR", str(self.PROJECT_ROOT / "downloads"))
 
-        # 安全配置
-        self.ALLOW_LOCALHOST = os.getenv("ALLOW_LOCALHOST", "false").lower() == "true"
-        self.ALLOW_PRIVATE_IPS = (
-            os.getenv("ALLOW_PRIVATE_IPS", "false").lower() == "true"
-        )
-        self.ADMIN_REQUIRED = os.getenv("ADMIN_REQUIRED", "true").lower() == "true"
+        # 按配置表一次性读取其余环境变量
+        for name, cast, default in self._SCHEMA:
+            setattr(self, name, cast(env(name, default)))
 
-        # 系统监控配置
-        self.MONITOR_INTERVAL = int(os.getenv("MONITOR_INTERVAL", "5"))  # 秒
-        self.CPU_THRESHOLD = float(os.getenv("CPU_THRESHOLD", "80.0"))  # %
-        self.MEMORY_THRESHOLD = float(os.getenv("MEMORY_THRESHOLD", "80.0"))  # %
+        # 预先解析日志文件大小上限
+        self.LOG_MAX_BYTES = self._parse_size(self.LOG_MAX_SIZE)
 
-        # 下载配置
-        self.DOWNLOAD_DIR = os.getenv(
-            "DOWNLOAD_DIR", str(self.PROJECT_ROOT / "downloads")
-        )
-        self.RATE_LIMIT_MB_PER_SEC = float(os.getenv("RATE_LIMIT_MB_PER_SEC", "0"))
+    def _ensure_log_dir(self) -> None:
+        """确保日志文件所在目录存在（仅首次调用时访问文件系统）"""
+        if not self._log_dir_ready:
+            Path(self.LOG_FILE).parent.mkdir(parents=True, exist_ok=True)
+            self._log_dir_ready = True
 
-        # 环境配置
-        self.ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
-        self.DEBUG = os.getenv("DEBUG", "false").lower() == "true"
+    def get_log_config(self) -> Mapping[str, Any]:
+        """获取日志配置（只读，首次调用后缓存）"""
+        if self._log_config is None:
+            self._ensure_log_dir()
+            self._log_config = MappingProxyType(self._build_log_config())
+        return self._log_config
 
-    def get_log_config(self) -> Dict[str, Any]:
-        """获取日志配置"""
+    def _build_log_config(self) -> Dict[str, Any]:
+        """构建日志配置字典"""
         return {
             "version": 1,
             "disable_existing_loggers": False,
-            "formatters": {
-                "standard": {
-                    "format": "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
-                },
-                "detailed": {
-                    "format": (
-                        "%(asctime)s [%(levelname)s] %(name)s:%(lineno)d: %(message)s"
-                    )
-                },
-            },
+            "formatters": _LOG_FORMATTERS,
             "handlers": {
                 "console": {
                     "level": self.LOG_LEVEL,
@@ -87,15 +132,25 @@ class Config:
                     "level": self.LOG_LEVEL,
                     "class": "logging.handlers.RotatingFileHandler",
                     "filename": self.LOG_FILE,
-                    "maxBytes": self._parse_size(self.LOG_MAX_SIZE),
+                    "maxBytes": self.LOG_MAX_BYTES,
                     "backupCount": self.LOG_BACKUP_COUNT,
                     "formatter": "detailed",
                     "encoding": "utf-8",
+                    # 首条日志写入时才打开文件
+                    "delay": True,
+                },
+                # 批量缓冲写入文件，遇到ERROR及以上级别立即刷新
+                "buffered_file": {
+                    "level": self.LOG_LEVEL,
+                    "class": "logging.handlers.MemoryHandler",
+                    "capacity": 1024,
+                    "flushLevel": logging.ERROR,
+                    "target": "file",
                 },
             },
             "loggers": {
                 "": {
-                    "handlers": ["console", "file"],
+                    "handlers": ["console", "buffered_file"],
                     "level": self.LOG_LEVEL,
                     "propagate": False,
                 }
@@ -104,17 +159,20 @@ class Config:
 
     def _parse_size(self, size_str: str) -> int:
         """解析大小字符串为字节数"""
-        size_str = size_str.upper()
-        if size_str.endswith("KB"):
-            return int(size_str[:-2]) * 1024
-        elif size_str.endswith("MB"):
-            return int(size_str[:-2]) * 1024 * 1024
-        elif size_str.endswith("GB"):
-            return int(size_str[:-2]) * 1024 * 1024 * 1024
-        return int(size_str)
+        match = _SIZE_PATTERN.fullmatch(size_str.upper())
+        if not match:
+            raise ValueError(f"无效的大小格式: {size_str}")
+        number, unit = match.groups()
+        return int(number) * _SIZE_UNITS[unit]
 
     def to_dict(self) -> Dict[str, Any]:
-        """转换为字典格式"""
+        """转换为字典格式（首次调用后缓存，每次返回可JSON序列化的副本）"""
+        if self._dict_cache is None:
+            self._dict_cache = self._build_dict()
+        return dict(self._dict_cache)
+
+    def _build_dict(self) -> Dict[str, Any]:
+        """构建配置摘要字典"""
         return {
             "project_root": str(self.PROJECT_ROOT),
             "log_level": self.LOG_LEVEL,
@@ -131,23 +189,19 @@ class Config:
 
     def validate(self) -> bool:
         """验证配置有效性"""
-        try:
+        checks = (
             # 检查端口范围
-            if not (1024 <= self.MCP_PORT <= 65535):
-                raise ValueError("MCP端口 {self.MCP_PORT} 超出有效范围")
-
+            (1024 <= self.MCP_PORT <= 65535, f"MCP端口 {self.MCP_PORT} 超出有效范围"),
             # 检查文件大小限制
-            if self.MAX_FILE_SIZE <= 0:
-                raise ValueError("最大文件大小必须大于0")
-
+            (self.MAX_FILE_SIZE > 0, "最大文件大小必须大于0"),
             # 检查并发数限制
-            if self.MAX_CONCURRENT_FILES <= 0:
-                raise ValueError("最大并发文件数必须大于0")
-
-            return True
-        except Exception:
-            logging.error("配置验证失败: {e}")
-            return False
+            (self.MAX_CONCURRENT_FILES > 0, "最大并发文件数必须大于0"),
+        )
+        for ok, message in checks:
+            if not ok:
+                logging.error("配置验证失败: %s", message)
+                return False
+        return True
 
 
 # 全局配置实例
@@ -3,28 +3,107 @@ AI-Tool 文件下载器
 基于参考实现的完整下载功能，支持断点续传、进度监控等特性
 """
 
+import functools
+import ipaddress
+import json
 import logging
 import os
-import re
+import random
+import shutil
 import time
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from io import BytesIO
-from pathlib import Path
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 from urllib.parse import urlparse
 
-import psutil
 import requests
 import validators
-from PIL import Image
+from PIL import Image, ImageFile
+from requests.adapters import HTTPAdapter
 
 from .config import config
 
+try:
+    # 可选依赖：只解析图片头部尺寸，无需初始化PIL解码器
+    import imagesize
+
+    IMAGESIZE_AVAILABLE = True
+except ImportError:
+    IMAGESIZE_AVAILABLE = False
+
+# 超过该大小且长度已知的下载文件预先分配磁盘空间
+PREALLOCATE_THRESHOLD = 4 * 1024 * 1024
+# 下载写文件的缓冲区大小
+WRITE_BUFFER_SIZE = 1024 * 1024
+# 未完成下载的临时文件后缀
+PARTIAL_SUFFIX = ".part"
+# 临时文件对应的续传校验信息（来源URL及ETag/Last-Modified）文件后缀
+RESUME_META_SUFFIX = ".meta"
+# 重试退避参数（秒）：base * 2^attempt，上限cap，另加0~jitter的随机抖动
+RETRY_BACKOFF_BASE = 0.5
+RETRY_BACKOFF_CAP = 30.0
+RETRY_JITTER = 0.5
+# 磁盘剩余空间缓存有效期（秒），单次写入超过剩余空间该比例时提前失效
+DISK_USAGE_TTL = 5
+DISK_USAGE_INVALIDATE_RATIO = 0.1
+# 并行批量下载时同一主机的最大并发连接数
+MAX_CONNECTIONS_PER_HOST = 8
+
+# 文件名中不允许出现的字符统一替换为下划线
+_FILENAME_TRANS = str.maketrans(dict.fromkeys('<>:"/\\|?*', "_"))
+# URL扩展名规范化映射
+_EXTENSION_ALIASES = {".jpeg": ".jpg"}
+# 图片快速完整性检查：(文件头签名, 文件尾结束标记, 标记是否必须位于末尾)
+# 单字节的GIF结束符在数据中很常见，必须是去掉尾部填充后的最后一个字节
+_IMAGE_MARKERS = (
+    (b"\xff\xd8\xff", b"\xff\xd9", False),  # JPEG: SOI ... EOI
+    (b"\x89PNG\r\n\x1a\n", b"IEND", False),  # PNG: 签名 ... IEND块
+    (b"GIF8", b"\x3b", True),  # GIF: 头部 ... 结束符
+)
+IMAGE_MARKER_PROBE_SIZE = 16
+# imagesize可识别的常见图片文件头签名及对应的PIL格式名称
+_IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", "JPEG"),
+    (b"\x89PNG\r\n\x1a\n", "PNG"),
+    (b"GIF8", "GIF"),
+    (b"BM", "BMP"),
+)
+# 解析远程图片头部时每次读取的大小及最多读取的字节数
+IMAGE_PROBE_CHUNK_SIZE = 8192
+IMAGE_PROBE_LIMIT = 1024 * 1024
+# imagesize最多解析的头部前缀大小，超出后不再累积，交由PIL增量解析
+IMAGE_QUICK_PROBE_LIMIT = 64 * 1024
+
 
 def validate_url(
     url: str, allow_localhost: bool = False, allow_private_ips: bool = False
 ) -> bool:
     """验证URL格式和安全性"""
+    return _validate_url_cached(url, bool(allow_localhost), bool(allow_private_ips))
+
+
+def _classify_host(hostname: str) -> str:
+    """判断主机类型：loopback（本机）、private（内网）或 public"""
+    if hostname == "localhost":
+        return "loopback"
+    try:
+        address = ipaddress.ip_address(hostname)
+    except ValueError:
+        return "public"  # 域名不做DNS解析，按公网地址处理
+    if address.is_loopback:
+        return "loopback"
+    if address.is_private or address.is_link_local:
+        return "private"
+    return "public"
+
+
+@functools.lru_cache(maxsize=4096)
+def _validate_url_cached(
+    url: str, allow_localhost: bool, allow_private_ips: bool
+) -> bool:
+    """validate_url的实际实现，同一URL和策略的结果会被缓存"""
     # 先检查基本的URL格式
     try:
         parsed = urlparse(url)
@@ -37,29 +116,77 @@ def validate_url(
     except Exception:
         return False
 
-    # 使用validators库进行更严格的验证，但对localhost特殊处理
     hostname = parsed.hostname
-    if hostname not in ["localhost", "127.0.0.1"]:
-        # 对于非localhost的URL，使用validators库验证
-        if not validators.url(url):
-            return False
+    host_type = _classify_host(hostname)
 
-    # 防止访问内网地址（除非明确允许）
-    if hostname:
-        # 检查localhost
-        if hostname in ["localhost", "127.0.0.1"] and not allow_localhost:
-            return False
-        # 检查私有IP
-        if (
-            hostname.startswith("192.168.")
-            or hostname.startswith("10.")
-            or hostname.startswith("172.")
-        ) and not allow_private_ips:
-            return False
+    # 使用validators库进行更严格的验证，但对本机地址特殊处理
+    if host_type != "loopback" and not validators.url(url):
+        return False
+
+    # 防止访问本机和内网地址（除非明确允许）
+    if host_type == "loopback" and not allow_localhost:
+        return False
+    if host_type == "private" and not allow_private_ips:
+        return False
 
     return True
 
 
+def _quick_image_size(
+    header: Union[bytes, bytearray],
+) -> Optional[Tuple[int, int, str]]:
+    """用imagesize从头部数据解析尺寸和格式，无法解析时返回None"""
+    format_name = next(
+        (name for signature, name in _IMAGE_SIGNATURES if header.startswith(signature)),
+        None,
+    )
+    if format_name is None:
+        return None
+    try:
+        width, height = imagesize.get(BytesIO(header))
+    except Exception:
+        return None  # 头部数据不足或格式异常，交给PIL处理
+    if width <= 0 or height <= 0:
+        return None
+    return width, height, format_name
+
+
+def _disk_usage_bucket() -> int:
+    """当前磁盘空间缓存的时间片编号"""
+    return int(time.monotonic() // DISK_USAGE_TTL)
+
+
+@functools.lru_cache(maxsize=256)
+def _cached_free_bytes(directory: str, time_bucket: int) -> int:
+    """查询目录所在磁盘的剩余空间（按时间片缓存，同一时间片内复用结果）"""
+    return shutil.disk_usage(directory).free
+
+
+def _has_intact_image_markers(path: str) -> Optional[bool]:
+    """
+    通过文件头的签名和文件尾的结束标记判断常见图片是否完整
+
+    Returns:
+        Optional[bool]: 结束标记完整返回True，缺失（传输被截断）返回False，
+            无法判断（非JPEG/PNG/GIF或读取失败）返回None
+    """
+    try:
+        with open(path, "rb") as f:
+            head = f.read(IMAGE_MARKER_PROBE_SIZE)
+            f.seek(0, os.SEEK_END)
+            f.seek(max(f.tell() - IMAGE_MARKER_PROBE_SIZE, 0))
+            tail = f.read()
+    except OSError:
+        return None
+
+    for signature, end_marker, at_end in _IMAGE_MARKERS:
+        if head.startswith(signature):
+            if at_end:
+                return tail.rstrip(b"\x00").endswith(end_marker)
+            return end_marker in tail
+    return None
+
+
 def sanitize_path(path: str) -> str:
     """清理和验证文件路径，防止路径遍历攻击"""
     # 移除危险字符
@@ -71,8 +198,8 @@ def sanitize_path(path: str) -> str:
 
 def sanitize_filename(filename: str) -> str:
     """清理文件名中的危险字符"""
-    # 移除或替换危险字符 (注意转义反斜杠)
-    filename = re.sub(r'[<>:"/\\|?*]', "_", filename)
+    # 替换危险字符
+    filename = filename.translate(_FILENAME_TRANS)
     # 限制文件名长度
     if len(filename) > 100:
         name, ext = os.path.splitext(filename)
@@ -82,34 +209,62 @@ def sanitize_filename(filename: str) -> str:
 
 def get_extension_from_url(url: str) -> str:
     """从URL推断文件扩展名"""
-    parsed = urlparse(url)
-    path = parsed.path.lower()
+    ext = os.path.splitext(urlparse(url).path.lower())[1]
 
-    # 特殊处理常见图片扩展名
-    if path.endswith((".jpg", ".jpeg")):
+    # 常见图片扩展名统一写法，未知或缺失扩展名时默认返回.jpg
+    if not ext or ext == ".unknown":
         return ".jpg"
-    elif path.endswith(".png"):
-        return ".png"
-    elif path.endswith(".gif"):
-        return ".gif"
-    elif path.endswith(".webp"):
-        return ".webp"
-
-    # 尝试从URL路径中提取其他扩展名
-    if "." in path:
-        ext = os.path.splitext(path)[1]
-        if ext and ext != ".unknown":
-            return ext
+    return _EXTENSION_ALIASES.get(ext, ext)
+
+
+@dataclass(frozen=True)
+class DownloadPlan:
+    """从响应头一次性解析出的下载参数，供大小检查和写文件共用"""
+
+    expected_bytes: Optional[int]  # 本次响应体的声明长度，未知时为None
+    max_bytes: int
+    content_type: str
+    direct_copy: bool  # 未压缩传输，可直接复制原始数据流
+    resume_from: int = 0
+
+    @classmethod
+    def from_response(
+        cls, response: requests.Response, max_file_size: int, resume_from: int = 0
+    ) -> "DownloadPlan":
+        """解析响应头生成下载计划"""
+        headers = response.headers
+        content_length = headers.get("content-length")
+        # 编码名不区分大小写，空值等同于identity
+        encoding = headers.get("content-encoding", "").strip().lower()
+        return cls(
+            expected_bytes=int(content_length) if content_length else None,
+            max_bytes=max_file_size * 1024 * 1024,
+            content_type=headers.get("content-type", ""),
+            direct_copy=encoding in ("", "identity"),
+            resume_from=resume_from,
+        )
 
-    # 如果没有扩展名或是未知扩展名，返回默认的.jpg
-    return ".jpg"
+    @property
+    def total_bytes(self) -> Optional[int]:
+        """下载完成后文件的预期总大小"""
+        if self.expected_bytes is None:
+            return None
+        return self.resume_from + self.expected_bytes
 
 
 class BaseDownloader(ABC):
     """下载器基类，定义通用的下载接口和功能"""
 
-    def __init__(self):
+    def __init__(self, pool_size: int = 64):
         self.session = requests.Session()
+
+        # 连接池大小需覆盖并行下载的最大并发数，保证同一主机的连接可复用
+        adapter = HTTPAdapter(
+            pool_connections=min(pool_size, 32), pool_maxsize=pool_size
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
         self.session.headers.update(
             {
                 "User-Agent": (
@@ -123,19 +278,29 @@ class BaseDownloader(ABC):
     def _check_disk_space(self, path: str, required_mb: int = 100) -> bool:
         """检查磁盘空间是否足够"""
         try:
-            free_bytes = psutil.disk_usage(os.path.dirname(path)).free
+            free_bytes = _cached_free_bytes(os.path.dirname(path), _disk_usage_bucket())
             free_mb = free_bytes / (1024 * 1024)
             return free_mb > required_mb
         except Exception:
             return True  # 无法检测时默认允许
 
+    @staticmethod
+    def _refresh_disk_space(path: str, written_bytes: int) -> None:
+        """写入量超过缓存剩余空间的一定比例时使缓存失效"""
+        try:
+            free_bytes = _cached_free_bytes(os.path.dirname(path), _disk_usage_bucket())
+        except OSError:
+            return
+        if written_bytes > free_bytes * DISK_USAGE_INVALIDATE_RATIO:
+            _cached_free_bytes.cache_clear()
+
     def _validate_download_request(
         self, url: str, output_path: str, max_file_size: int
     ) -> str:
         """验证下载请求的有效性"""
         # 验证URL
         if not validate_url(url, config.ALLOW_LOCALHOST, config.ALLOW_PRIVATE_IPS):
-            raise ValueError("无效的URL: {url}")
+            raise ValueError(f"无效的URL: {url}")
 
         # 清理输出路径
         output_path = sanitize_path(output_path)
@@ -148,43 +313,238 @@ class BaseDownloader(ABC):
 
     def _check_file_exists(self, output_path: str, overwrite: bool) -> bool:
         """检查文件是否已存在"""
-        return os.path.exists(output_path) and not overwrite
+        return not overwrite and os.path.exists(output_path)
 
     def _create_output_directory(self, output_path: str) -> None:
         """创建输出目录"""
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
-    def _check_file_size_limit(
-        self, response: requests.Response, max_file_size: int
+    def _open_download(
+        self, url: str, timeout: int, part_path: str
+    ) -> Tuple[requests.Response, int]:
+        """发起下载请求，存在未完成的临时文件时通过Range续传，返回响应和续传起点"""
+        try:
+            resume_from = os.path.getsize(part_path)
+        except OSError:
+            resume_from = 0
+
+        if resume_from:
+            validator = self._read_resume_validator(part_path, url)
+            if validator is None:
+                # 无法确认临时文件来自同一URL的同一版本资源，丢弃后完整下载
+                self._discard_partial(part_path)
+                resume_from = 0
+
+        if resume_from:
+            # If-Range：资源已变化时服务器返回完整内容（200）而不是拼接旧数据
+            response = self.session.get(
+                url,
+                timeout=timeout,
+                stream=True,
+                headers={"Range": f"bytes={resume_from}-", "If-Range": validator},
+            )
+            try:
+                if response.status_code == 206:
+                    return response, resume_from
+
+                # 请求失败时保留临时文件，留待下次重试续传
+                if response.status_code != 416:
+                    response.raise_for_status()
+            except BaseException:
+                response.close()
+                raise
+
+            # 不支持续传或资源已变化（200）、临时文件已失效（416）：丢弃后完整下载
+            self._discard_partial(part_path)
+            if response.status_code != 416:
+                self._save_resume_validator(part_path, url, response)
+                return response, 0
+            response.close()
+
+        response = self.session.get(url, timeout=timeout, stream=True)
+        try:
+            response.raise_for_status()
+        except BaseException:
+            response.close()
+            raise
+        self._save_resume_validator(part_path, url, response)
+        return response, 0
+
+    @staticmethod
+    def _read_resume_validator(part_path: str, url: str) -> Optional[str]:
+        """读取临时文件的续传校验值，来源URL不同或信息缺失时返回None"""
+        try:
+            with open(part_path + RESUME_META_SUFFIX, encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(meta, dict) or meta.get("url") != url:
+            return None
+        return meta.get("validator") or None
+
+    @staticmethod
+    def _save_resume_validator(
+        part_path: str, url: str, response: requests.Response
     ) -> None:
+        """记录完整下载响应的校验值（强ETag优先，其次Last-Modified），供续传时校验"""
+        etag = response.headers.get("etag", "")
+        # If-Range只接受强ETag
+        validator = etag if etag and not etag.startswith("W/") else None
+        validator = validator or response.headers.get("last-modified")
+        meta_path = part_path + RESUME_META_SUFFIX
+        try:
+            if validator:
+                with open(meta_path, "w", encoding="utf-8") as f:
+                    json.dump({"url": url, "validator": validator}, f)
+            else:
+                # 没有校验值的资源不能安全续传
+                os.remove(meta_path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _discard_partial(part_path: str) -> None:
+        """删除未完成的临时文件及其续传校验信息"""
+        for path in (part_path, part_path + RESUME_META_SUFFIX):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def _reject_path_collisions(
+        output_dir: str, jobs: List[Tuple[str, str]]
+    ) -> Tuple[List[Tuple[str, str]], List[Dict[str, Any]]]:
+        """同一输出路径只保留第一个任务，其余任务标记为失败，避免并发写入同一文件"""
+        claimed: Dict[str, str] = {}
+        pending = []
+        rejected = []
+        for url, filename in jobs:
+            output_path = sanitize_path(os.path.join(output_dir, filename))
+            key = os.path.normcase(output_path)
+            if key in claimed:
+                rejected.append(
+                    {
+                        "status": "failed",
+                        "error": f"文件名冲突: 与 {claimed[key]} 的输出路径相同",
+                        "url": url,
+                        "filepath": output_path,
+                        "retryable": False,
+                    }
+                )
+            else:
+                claimed[key] = url
+                pending.append((url, filename))
+        return pending, rejected
+
+    @staticmethod
+    def _create_batch_directories(output_dir: str, filenames: List[str]) -> None:
+        """为批量下载去重后一次性创建所有输出目录"""
+        directories = {output_dir}
+        directories.update(
+            os.path.dirname(sanitize_path(os.path.join(output_dir, filename)))
+            for filename in filenames
+        )
+        for directory in directories:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def _partition_existing(
+        output_dir: str, jobs: List[Tuple[str, str]]
+    ) -> Tuple[List[Tuple[str, str]], List[Dict[str, Any]]]:
+        """按目录一次性列出已有文件，目标已存在的任务直接标记为跳过"""
+        listings: Dict[str, set] = {}
+        pending = []
+        skipped = []
+        for url, filename in jobs:
+            output_path = sanitize_path(os.path.join(output_dir, filename))
+            directory, name = os.path.split(output_path)
+            if directory not in listings:
+                try:
+                    with os.scandir(directory) as entries:
+                        listings[directory] = {entry.name for entry in entries}
+                except OSError:
+                    listings[directory] = set()
+
+            if name in listings[directory]:
+                skipped.append(
+                    {
+                        "status": "skipped",
+                        "filepath": output_path,
+                        "reason": "file_exists",
+                    }
+                )
+            else:
+                pending.append((url, filename))
+        return pending, skipped
+
+    def _check_file_size_limit(self, plan: DownloadPlan, max_file_size: int) -> None:
         """检查文件大小限制"""
-        content_length = response.headers.get("content-length")
-        if content_length:
-            size_mb = int(content_length) / (1024 * 1024)
-            if size_mb > max_file_size:
-                raise ValueError("文件过大: {size_mb:.1f}MB > {max_file_size}MB")
+        total_bytes = plan.total_bytes
+        if total_bytes is not None and total_bytes > plan.max_bytes:
+            size_mb = total_bytes / (1024 * 1024)
+            raise ValueError(f"文件过大: {size_mb:.1f}MB > {max_file_size}MB")
 
     def _save_file_with_size_check(
-        self, response: requests.Response, output_path: str, max_file_size: int
+        self,
+        response: requests.Response,
+        output_path: str,
+        max_file_size: int,
+        plan: DownloadPlan,
     ) -> int:
-        """保存文件并检查大小限制"""
-        downloaded_size = 0
-        max_bytes = max_file_size * 1024 * 1024
-
-        with open(output_path, "wb") as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
-                    downloaded_size += len(chunk)
-
-                    # 检查下载大小限制
-                    if downloaded_size > max_bytes:
-                        f.close()
-                        os.remove(output_path)
-                        raise ValueError("文件过大: 超过{max_file_size}MB限制")
+        """保存文件并检查大小限制（续传时接在已有内容之后写入）"""
+        resume_from = plan.resume_from
+        downloaded_size = resume_from
+        max_bytes = plan.max_bytes
+        expected_size = plan.expected_bytes or 0
+        preallocated = expected_size > PREALLOCATE_THRESHOLD
+        # 声明长度已通过大小检查，未压缩时可直接复制原始数据流，无需逐块检查大小
+        direct_copy = expected_size > 0 and plan.direct_copy
+        # 续传时定位到已有内容末尾写入（追加模式会越过预分配的空间）
+        mode = "r+b" if resume_from else "wb"
+
+        with open(output_path, mode, buffering=WRITE_BUFFER_SIZE) as f:
+            f.seek(resume_from)
+            if preallocated:
+                self._preallocate(f.fileno(), resume_from, expected_size)
+
+            try:
+                if direct_copy:
+                    # urllib3会按Content-Length读取，数据不足时抛出异常
+                    shutil.copyfileobj(response.raw, f, config.DOWNLOAD_CHUNK_SIZE)
+                    downloaded_size = f.tell()
+                else:
+                    # iter_content不会产出空块，write直接返回写入的字节数
+                    write = f.write
+                    for chunk in response.iter_content(
+                        chunk_size=config.DOWNLOAD_CHUNK_SIZE
+                    ):
+                        downloaded_size += write(chunk)
+
+                        # 检查下载大小限制
+                        if downloaded_size > max_bytes:
+                            f.close()
+                            os.remove(output_path)
+                            raise ValueError(f"文件过大: 超过{max_file_size}MB限制")
+            finally:
+                # 无论成功与否都截去未写入的预分配空间，使文件大小等于实际写入量，
+                # 中途失败后下次可按文件大小正确续传
+                if preallocated and not f.closed:
+                    f.truncate(f.tell())
 
         return downloaded_size
 
+    @staticmethod
+    def _preallocate(fd: int, offset: int, size: int) -> None:
+        """预分配磁盘空间并提示顺序写入（平台不支持时跳过）"""
+        try:
+            if hasattr(os, "posix_fallocate"):
+                os.posix_fallocate(fd, offset, size)
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(fd, offset, size, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass  # 预分配只是优化，失败时照常写入
+
     @abstractmethod
     def _validate_file_type(
         self, response: requests.Response, url: str, **kwargs
@@ -202,9 +562,17 @@ class BaseDownloader(ABC):
         overwrite: bool = False,
         timeout: int = 30,
         max_file_size: int = 100,
+        create_dirs: bool = True,
+        check_exists: bool = True,
         **kwargs,
     ) -> Dict[str, Any]:
-        """下载单个文件的通用方法"""
+        """
+        下载单个文件的通用方法
+
+        批量下载已预先建好目录并批量检查过已有文件，此时传入
+        create_dirs=False、check_exists=False跳过逐个文件的检查
+        """
+        part_path = None
         try:
             # 验证下载请求
             output_path = self._validate_download_request(
@@ -212,7 +580,7 @@ class BaseDownloader(ABC):
             )
 
             # 检查文件是否已存在
-            if self._check_file_exists(output_path, overwrite):
+            if check_exists and self._check_file_exists(output_path, overwrite):
                 return {
                     "status": "skipped",
                     "filepath": output_path,
@@ -220,23 +588,30 @@ class BaseDownloader(ABC):
                 }
 
             # 创建目录
-            self._create_output_directory(output_path)
-
-            # 下载文件
-            response = self.session.get(url, timeout=timeout, stream=True)
-            response.raise_for_status()
-
-            # 验证文件类型
-            if not self._validate_file_type(response, url, **kwargs):
-                raise ValueError("文件类型验证失败")
-
-            # 检查文件大小
-            self._check_file_size_limit(response, max_file_size)
-
-            # 保存文件
-            downloaded_size = self._save_file_with_size_check(
-                response, output_path, max_file_size
-            )
+            if create_dirs:
+                self._create_output_directory(output_path)
+
+            # 下载文件（先写入临时文件，重试时可从断点续传）
+            part_path = output_path + PARTIAL_SUFFIX
+            response, resume_from = self._open_download(url, timeout, part_path)
+
+            # 流式请求此时只收到了响应头；校验失败时关闭连接，不再接收响应体
+            with response:
+                # 验证文件类型
+                if not self._validate_file_type(response, url, **kwargs):
+                    raise ValueError("文件类型验证失败")
+
+                # 检查文件大小
+                plan = DownloadPlan.from_response(response, max_file_size, resume_from)
+                self._check_file_size_limit(plan, max_file_size)
+
+                # 保存文件
+                downloaded_size = self._save_file_with_size_check(
+                    response, part_path, max_file_size, plan
+                )
+            os.replace(part_path, output_path)
+            self._discard_partial(part_path)
+            self._refresh_disk_space(output_path, downloaded_size - resume_from)
 
             # 下载后验证
             self._post_download_validation(output_path, **kwargs)
@@ -246,12 +621,185 @@ class BaseDownloader(ABC):
                 "filepath": output_path,
                 "size": downloaded_size,
                 "url": url,
-                "content_type": response.headers.get("content-type", ""),
+                "content_type": plan.content_type,
             }
 
         except Exception as e:
-            self.logger.error("下载失败 {url}: {str(e)}")
-            return {"status": "failed", "error": str(e), "url": url}
+            self.logger.error("下载失败 %s: %s", url, e)
+            failure = self._describe_failure(e)
+            # 永久性错误不会再续传，清理临时文件
+            if part_path and not failure["retryable"]:
+                try:
+                    self._discard_partial(part_path)
+                except OSError:
+                    pass
+            return {
+                "status": "failed",
+                "error": str(e),
+                "url": url,
+                **failure,
+            }
+
+    @staticmethod
+    def _retry_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+        """计算重试等待时间：指数退避加随机抖动，服务器指定Retry-After时优先"""
+        if retry_after is not None:
+            return min(retry_after, RETRY_BACKOFF_CAP)
+        backoff = min(RETRY_BACKOFF_CAP, RETRY_BACKOFF_BASE * 2**attempt)
+        return backoff + random.uniform(0, RETRY_JITTER)
+
+    @staticmethod
+    def _describe_failure(error: Exception) -> Dict[str, Any]:
+        """提取失败的HTTP状态码及是否值得重试"""
+        if isinstance(error, ValueError):
+            # 参数、大小、类型等校验失败，重试结果不会改变
+            return {"retryable": False}
+
+        response = getattr(error, "response", None)
+        if not isinstance(error, requests.HTTPError) or response is None:
+            return {"retryable": True}
+
+        status_code = response.status_code
+        info = {
+            "status_code": status_code,
+            # 4xx中只有请求超时和限流值得重试
+            "retryable": status_code >= 500 or status_code in (408, 429),
+        }
+        retry_after = response.headers.get("retry-after", "")
+        if retry_after.isdigit():
+            info["retry_after"] = float(retry_after)
+        return info
+
+    def _prepare_batch(
+        self, urls: List[str], filenames: List[str], output_dir: str, overwrite: bool
+    ) -> Tuple[List[Tuple[str, str]], Dict[str, Any]]:
+        """批量下载前的准备：去重、排除路径冲突、创建目录、预先跳过已存在的文件"""
+        # 重复的(URL, 文件名)只下载一次，total仍为提交的数量，重复数单独计入duplicates
+        jobs = list(dict.fromkeys(zip(urls, filenames)))
+        results = self._new_batch_results(len(urls))
+        results["duplicates"] = len(urls) - len(jobs)
+
+        # 不同URL解析到同一输出路径时直接判为失败
+        jobs, collided = self._reject_path_collisions(output_dir, jobs)
+        results["failed"] += len(collided)
+        results["details"].extend(collided)
+
+        # 一次性创建所有输出目录，单个下载不再逐个检查
+        self._create_batch_directories(output_dir, [filename for _, filename in jobs])
+
+        if not overwrite:
+            jobs, skipped = self._partition_existing(output_dir, jobs)
+            results["skipped"] += len(skipped)
+            results["details"].extend(skipped)
+        return jobs, results
+
+    def _new_batch_results(self, total: int) -> Dict[str, Any]:
+        """创建批量下载结果容器"""
+        return {
+            "total": total,
+            "success": 0,
+            "failed": 0,
+            "skipped": 0,
+            "duplicates": 0,
+            "details": [],
+            "duration": 0,
+        }
+
+    def _download_with_retry(
+        self,
+        url: str,
+        output_path: str,
+        overwrite: bool,
+        timeout: int,
+        retry_count: int,
+        max_file_size: int,
+        **kwargs,
+    ) -> Tuple[str, List[Dict[str, Any]]]:
+        """下载单个文件（带重试），返回最终状态和所有尝试的详情"""
+        details = []
+        last_error = None
+        attempts = 0
+
+        for attempt in range(retry_count + 1):
+            attempts += 1
+            retry_after = None
+            try:
+                result = self.download_single_file(
+                    url, output_path, overwrite, timeout, max_file_size, **kwargs
+                )
+                details.append(result)
+
+                if result["status"] in ("success", "skipped"):
+                    return result["status"], details
+                last_error = result.get("error", "Unknown error")
+
+                # 永久性错误（如404、文件过大）不再重试
+                if not result.get("retryable", True):
+                    break
+                retry_after = result.get("retry_after")
+
+            except Exception as e:
+                last_error = str(e)
+
+            if attempt < retry_count:
+                time.sleep(self._retry_delay(attempt, retry_after))
+
+        details.append(
+            {
+                "status": "failed",
+                "error": last_error,
+                "url": url,
+                "attempts": attempts,
+            }
+        )
+        return "failed", details
+
+    @staticmethod
+    def _plan_host_lanes(
+        jobs: List[Tuple[str, str]], max_lanes_per_host: int
+    ) -> List[List[Tuple[str, str]]]:
+        """按主机将下载任务划分为通道，不同主机的通道交错排列"""
+        buckets: Dict[str, List[Tuple[str, str]]] = {}
+        for url, filename in jobs:
+            host = urlparse(url).netloc.lower()
+            buckets.setdefault(host, []).append((url, filename))
+
+        host_lanes = []
+        for host_jobs in buckets.values():
+            lane_count = min(len(host_jobs), max_lanes_per_host)
+            host_lanes.append([host_jobs[i::lane_count] for i in range(lane_count)])
+
+        # 轮流从各主机取通道，避免线程池开头全部压在同一主机上
+        lanes = []
+        for i in range(max((len(h) for h in host_lanes), default=0)):
+            lanes.extend(h[i] for h in host_lanes if i < len(h))
+        return lanes
+
+    def _download_lane(
+        self,
+        jobs: List[Tuple[str, str]],
+        output_dir: str,
+        overwrite: bool,
+        timeout: int,
+        retry_count: int,
+        max_file_size: int,
+        **kwargs,
+    ) -> List[Tuple[str, List[Dict[str, Any]]]]:
+        """在当前线程内顺序下载一组文件"""
+        return [
+            self._download_with_retry(
+                url,
+                os.path.join(output_dir, filename),
+                overwrite,
+                timeout,
+                retry_count,
+                max_file_size,
+                create_dirs=False,
+                check_exists=False,
+                **kwargs,
+            )
+            for url, filename in jobs
+        ]
 
     def batch_download_sequential(
         self,
@@ -266,61 +814,76 @@ class BaseDownloader(ABC):
     ) -> Dict[str, Any]:
         """顺序批量下载文件"""
         start_time = time.time()
-        results = {
-            "total": len(urls),
-            "success": 0,
-            "failed": 0,
-            "skipped": 0,
-            "details": [],
-            "duration": 0,
-        }
-
-        # 创建输出目录
-        Path(output_dir).mkdir(parents=True, exist_ok=True)
+        jobs, results = self._prepare_batch(urls, filenames, output_dir, overwrite)
 
         # 顺序下载每个文件
-        for url, filename in zip(urls, filenames):
-            output_path = os.path.join(output_dir, filename)
+        for status, details in self._download_lane(
+            jobs, output_dir, overwrite, timeout, retry_count, max_file_size, **kwargs
+        ):
+            results[status] += 1
+            results["details"].extend(details)
 
-            # 重试机制
-            success = False
-            last_error = None
+        results["duration"] = time.time() - start_time
+        return results
 
-            for attempt in range(retry_count + 1):
-                try:
-                    result = self.download_single_file(
-                        url, output_path, overwrite, timeout, max_file_size, **kwargs
-                    )
-                    results["details"].append(result)
-
-                    if result["status"] == "success":
-                        results["success"] += 1
-                        success = True
-                        break
-                    elif result["status"] == "skipped":
-                        results["skipped"] += 1
-                        success = True
-                        break
-                    else:
-                        last_error = result.get("error", "Unknown error")
-                        if attempt < retry_count:
-                            time.sleep(1)  # 重试前等待1秒
-
-                except Exception as e:
-                    last_error = str(e)
-                    if attempt < retry_count:
-                        time.sleep(1)  # 重试前等待1秒
-
-            if not success:
-                results["failed"] += 1
-                results["details"].append(
-                    {
-                        "status": "failed",
-                        "error": last_error,
-                        "url": url,
-                        "attempts": retry_count + 1,
-                    }
+    def batch_download_parallel(
+        self,
+        urls: List[str],
+        filenames: List[str],
+        output_dir: str,
+        overwrite: bool = False,
+        timeout: int = 30,
+        retry_count: int = 2,
+        max_file_size: int = 100,
+        max_workers: int = 16,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """使用线程池并行批量下载文件（max_workers<=1时退化为顺序下载）"""
+        if max_workers <= 1 or len(urls) <= 1:
+            return self.batch_download_sequential(
+                urls,
+                filenames,
+                output_dir,
+                overwrite,
+                timeout,
+                retry_count,
+                max_file_size,
+                **kwargs,
+            )
+
+        start_time = time.time()
+        jobs, results = self._prepare_batch(urls, filenames, output_dir, overwrite)
+
+        # 按主机分组，每条通道内顺序下载以复用同一个keep-alive连接
+        lanes = self._plan_host_lanes(jobs, MAX_CONNECTIONS_PER_HOST)
+        workers = max(1, min(max_workers, len(lanes)))
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    self._download_lane,
+                    lane,
+                    output_dir,
+                    overwrite,
+                    timeout,
+                    retry_count,
+                    max_file_size,
+                    **kwargs,
                 )
+                for lane in lanes
+            ]
+
+            # 结果只在当前线程汇总，无需加锁
+            try:
+                for future in as_completed(futures):
+                    for status, details in future.result():
+                        results[status] += 1
+                        results["details"].extend(details)
+            except KeyboardInterrupt:
+                # 取消尚未开始的下载任务
+                for future in futures:
+                    future.cancel()
+                raise
 
         results["duration"] = time.time() - start_time
         return results
@@ -354,18 +917,16 @@ class BaseDownloader(ABC):
             return info
 
         except Exception as e:
-            self.logger.error("获取文件信息失败 {url}: {str(e)}")
+            self.logger.error("获取文件信息失败 %s: %s", url, e)
             return {"error": str(e)}
 
 
 class FileDownloader(BaseDownloader):
     """通用文件下载器，支持各种文件类型的下载"""
 
-    def __init__(self):
-        super().__init__()
-
-        # 定义常见的安全文件类型
-        self.safe_mime_types = {
+    # 定义常见的安全文件类型
+    safe_mime_types = frozenset(
+        {
             # 文档类型
             "text/plain",
             "text/html",
@@ -415,9 +976,11 @@ class FileDownloader(BaseDownloader):
             # 其他常见类型
             "application/octet-stream",  # 通用二进制文件
         }
+    )
 
-        # 定义安全的文件扩展名
-        self.safe_extensions = {
+    # 定义安全的文件扩展名
+    safe_extensions = frozenset(
+        {
             ".txt",
             ".html",
             ".htm",
@@ -463,6 +1026,12 @@ class FileDownloader(BaseDownloader):
             ".csv",
             ".log",
         }
+    )
+
+    # 图片文件扩展名
+    image_extensions = frozenset(
+        {".jpg", ".jpeg", ".png", ".gif", ".webp", ".svg", ".bmp", ".tif"}
+    )
 
     def _is_safe_file_type(self, content_type: str, file_extension: str) -> bool:
         """检查文件类型是否安全"""
@@ -493,7 +1062,7 @@ class FileDownloader(BaseDownloader):
         is_safe = self._is_safe_file_type(content_type, file_extension)
         if not is_safe:
             self.logger.warning(
-                "文件类型可能不安全: {content_type}, 扩展名: {file_extension}"
+                "文件类型可能不安全: %s, 扩展名: %s", content_type, file_extension
             )
 
         return True  # 即使不安全也允许下载，只是警告
@@ -507,6 +1076,15 @@ class FileDownloader(BaseDownloader):
 
     def _validate_image_file(self, output_path: str) -> None:
         """验证图片文件的完整性"""
+        # 常见格式检查文件头尾标记：缺少结束标记即视为截断（PIL的verify不会发现截断）
+        intact = _has_intact_image_markers(output_path)
+        if intact:
+            return
+        if intact is False:
+            os.remove(output_path)
+            raise ValueError("下载的图片文件不完整（缺少结束标记）")
+
+        # 其他格式交给PIL完整校验
         try:
             with Image.open(output_path) as img:
                 img.verify()
@@ -516,16 +1094,10 @@ class FileDownloader(BaseDownloader):
 
     def _is_image_file(self, content_type: str, file_extension: str) -> bool:
         """判断是否为图片文件"""
-        return content_type.startswith("image/") or file_extension.lower() in {
-            ".jpg",
-            ".jpeg",
-            ".png",
-            ".gif",
-            ".webp",
-            ".svg",
-            ".bmp",
-            ".tif",
-        }
+        return (
+            content_type.startswith("image/")
+            or file_extension.lower() in self.image_extensions
+        )
 
     def download_file(
         self,
@@ -589,16 +1161,7 @@ class FileDownloader(BaseDownloader):
 
             # 尝试获取图片尺寸和格式信息
             try:
-                response = self.session.get(url, timeout=timeout, stream=True)
-                response.raise_for_status()
-
-                # 读取前8KB数据尝试获取尺寸
-                chunk = next(response.iter_content(chunk_size=8192))
-
-                # 使用PIL获取图片尺寸
-                with Image.open(BytesIO(chunk)) as img:
-                    width, height = img.size
-                    format_name = img.format
+                width, height, format_name = self._probe_image_header(url, timeout)
 
                 info.update(
                     {
@@ -609,9 +1172,9 @@ class FileDownloader(BaseDownloader):
                     }
                 )
 
-            except Exception:
+            except Exception as e:
                 # 如果获取尺寸失败，保持基本信息
-                self.logger.debug("无法获取图片尺寸: {str(e)}")
+                self.logger.debug("无法获取图片尺寸: %s", e)
                 info["is_image"] = True
 
             return info
@@ -619,6 +1182,35 @@ class FileDownloader(BaseDownloader):
         except Exception as e:
             return {"error": str(e), "url": url}
 
+    def _probe_image_header(self, url: str, timeout: int) -> Tuple[int, int, str]:
+        """边下载边解析图片头部，解析出尺寸和格式后立即断开连接"""
+        parser = ImageFile.Parser()
+        # 优先用imagesize解析，识别不了的格式再由PIL解析
+        header = bytearray() if IMAGESIZE_AVAILABLE else None
+        probed = 0
+
+        with self.session.get(url, timeout=timeout, stream=True) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(chunk_size=IMAGE_PROBE_CHUNK_SIZE):
+                if header is not None:
+                    header += chunk
+                    # 仅在首块和前缀攒满时各解析一次，避免每块都复制并重新解析
+                    full = len(header) >= IMAGE_QUICK_PROBE_LIMIT
+                    if len(header) == len(chunk) or full:
+                        quick = _quick_image_size(header)
+                        if quick is not None:
+                            return quick
+                    if full:
+                        header = None
+                parser.feed(chunk)
+                probed += len(chunk)
+                if parser.image is not None or probed >= IMAGE_PROBE_LIMIT:
+                    break
+
+        if parser.image is None:
+            raise ValueError("无法从文件头部解析图片信息")
+        return parser.image.width, parser.image.height, parser.image.format
+
     def batch_download_files(
         self,
         urls: Union[str, List[str]],
@@ -630,6 +1222,7 @@ class FileDownloader(BaseDownloader):
         max_file_size: int = 100,
         check_file_type: bool = True,
         validate_image: bool = False,
+        max_concurrent: int = 16,
     ) -> Dict[str, Any]:
         """批量下载文件的统一接口"""
         # 标准化输入参数
@@ -643,7 +1236,7 @@ class FileDownloader(BaseDownloader):
             raise ValueError("URLs和文件名数量不匹配")
 
         # 调用批量下载方法
-        return self.batch_download_sequential(
+        return self.batch_download_parallel(
             urls,
             filenames,
             output_dir,
@@ -651,6 +1244,7 @@ class FileDownloader(BaseDownloader):
             timeout,
             retry_count,
             max_file_size,
+            max_workers=max_concurrent,
             check_file_type=check_file_type,
             validate_image=validate_image,
         )
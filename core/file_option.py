@@ -5,16 +5,82 @@
 文件操作模块：提供查看、创建和编辑本地文件的功能
 """
 
-import datetime
+import codecs
+import errno
+import functools
 import os
 import shutil
 import stat
-from typing import Any, Dict
+import tempfile
+import time
+from typing import Any, Dict, Optional, TextIO
+
+# 文件读写缓冲区大小，大文件可减少read/write系统调用次数
+FILE_BUFFER_SIZE = 256 * 1024
+# 超过该大小的文件读取前提示内核按顺序预读
+SEQUENTIAL_READ_THRESHOLD = 1024 * 1024
+# copy_file_range单次复制的最大字节数
+COPY_CHUNK_SIZE = 64 * 1024 * 1024
+# 路径不存在（包括路径中间部分不是目录）时系统调用抛出的异常
+_MISSING_PATH_ERRORS = (FileNotFoundError, NotADirectoryError)
+# 这些错误表示当前文件系统不支持copy_file_range，需回退到普通复制
+_COPY_RANGE_FALLBACK_ERRNOS = frozenset(
+    (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EPERM)
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_timestamp(seconds: int) -> str:
+    """将时间戳（整秒）格式化为本地时间字符串，同一秒内的结果直接复用"""
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(seconds))
 
 
 class FileOption:
     """文件操作类，提供文件的基本操作功能"""
 
+    @staticmethod
+    def _stat_path(path: str) -> Optional[os.stat_result]:
+        """获取路径的stat信息，路径不存在或无法访问时返回None（与os.path.exists一致）"""
+        try:
+            return os.stat(path)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _ensure_parent_dir(path: str) -> None:
+        """确保文件所在目录存在（目录已存在时只需一次stat）"""
+        parent = os.path.dirname(os.path.abspath(path))
+        if not os.path.isdir(parent):
+            os.makedirs(parent, exist_ok=True)
+
+    @staticmethod
+    def _open_for_write(file_path: str, mode: str, encoding: str) -> TextIO:
+        """以写入模式打开文件，仅在所在目录不存在导致失败时创建目录"""
+        try:
+            return open(file_path, mode, encoding=encoding, buffering=FILE_BUFFER_SIZE)
+        except FileNotFoundError:
+            os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+            return open(file_path, mode, encoding=encoding, buffering=FILE_BUFFER_SIZE)
+
+    @staticmethod
+    def _copy_file_data(source_path: str, dest_path: str) -> None:
+        """复制文件内容，Linux下优先在内核中完成复制（文件系统支持时可共享数据块）"""
+        if hasattr(os, "copy_file_range"):
+            if os.path.exists(dest_path) and os.path.samefile(source_path, dest_path):
+                raise shutil.SameFileError(f"源文件和目标文件相同: {source_path}")
+            try:
+                with open(source_path, "rb") as src, open(dest_path, "wb") as dst:
+                    src_fd, dst_fd = src.fileno(), dst.fileno()
+                    if hasattr(os, "posix_fadvise"):
+                        os.posix_fadvise(src_fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                    while os.copy_file_range(src_fd, dst_fd, COPY_CHUNK_SIZE):
+                        pass
+                return
+            except OSError as e:
+                if e.errno not in _COPY_RANGE_FALLBACK_ERRNOS:
+                    raise
+        shutil.copyfile(source_path, dest_path)
+
     @staticmethod
     def read_file(file_path: str, encoding: str = "utf-8") -> str:
         """
@@ -28,10 +94,27 @@ class FileOption:
             str: 文件内容
         """
         try:
-            with open(file_path, "r", encoding=encoding) as f:
-                return f.read()
-        except Exception:
-            return "读取文件失败: {str(e)}"
+            # 无缓冲二进制读取：按fstat得到的大小一次读完，再整体解码
+            with open(file_path, "rb", buffering=0) as f:
+                FileOption._advise_sequential(f.fileno())
+                content = f.read().decode(encoding)
+            # 与文本模式一致，统一换行符为\n
+            if "\r" in content:
+                content = content.replace("\r\n", "\n").replace("\r", "\n")
+            return content
+        except Exception as e:
+            return f"读取文件失败: {str(e)}"
+
+    @staticmethod
+    def _advise_sequential(fd: int) -> None:
+        """大文件提示内核顺序预读（平台不支持时跳过）"""
+        if not hasattr(os, "posix_fadvise"):
+            return
+        try:
+            if os.fstat(fd).st_size > SEQUENTIAL_READ_THRESHOLD:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass  # 预读提示只是优化，失败时照常读取
 
     @staticmethod
     def write_file(
@@ -49,10 +132,8 @@ class FileOption:
             Dict[str, Any]: 操作结果
         """
         try:
-            # 确保目录存在
-            os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
-
-            with open(file_path, "w", encoding=encoding) as f:
+            # 所在目录不存在时才创建
+            with FileOption._open_for_write(file_path, "w", encoding) as f:
                 f.write(content)
 
             return {
@@ -83,10 +164,8 @@ class FileOption:
             Dict[str, Any]: 操作结果
         """
         try:
-            # 确保目录存在
-            os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
-
-            with open(file_path, "a", encoding=encoding) as f:
+            # 所在目录不存在时才创建
+            with FileOption._open_for_write(file_path, "a", encoding) as f:
                 f.write(content)
 
             return {
@@ -118,37 +197,39 @@ class FileOption:
             Dict[str, Any]: 操作结果
         """
         try:
-            if not os.path.exists(file_path):
+            # 读取文件内容（直接打开，由异常判断文件是否存在）
+            try:
+                with open(
+                    file_path, "r", encoding=encoding, buffering=FILE_BUFFER_SIZE
+                ) as f:
+                    content = f.read()
+            except _MISSING_PATH_ERRORS:
                 return {
                     "success": False,
                     "message": f"文件不存在: {file_path}",
                     "path": file_path,
                 }
 
-            # 读取文件内容
-            with open(file_path, "r", encoding=encoding) as f:
-                content = f.read()
-
-            # 检查是否包含要替换的内容
-            if old_content not in content:
+            # 检查是否包含要替换的内容（计数同时完成存在性检查）
+            replaced_count = content.count(old_content)
+            if not replaced_count:
                 return {
                     "success": False,
                     "message": f"文件中未找到要替换的内容: {old_content}",
                     "path": file_path,
                 }
 
-            # 替换内容
-            new_file_content = content.replace(old_content, new_content)
+            # 替换内容（直接覆盖原变量，尽早释放旧内容）
+            content = content.replace(old_content, new_content)
 
-            # 写入新内容
-            with open(file_path, "w", encoding=encoding) as f:
-                f.write(new_file_content)
+            # 写入同目录下的临时文件后原子替换，避免写入中途失败损坏原文件
+            FileOption._atomic_write_text(file_path, content, encoding)
 
             return {
                 "success": True,
                 "message": f"文件编辑成功: {file_path}",
                 "path": file_path,
-                "replaced_count": content.count(old_content),
+                "replaced_count": replaced_count,
             }
         except Exception as e:
             return {
@@ -157,6 +238,78 @@ class FileOption:
                 "path": file_path,
             }
 
+    @staticmethod
+    def _atomic_write_text(file_path: str, content: str, encoding: str) -> None:
+        """写入临时文件后替换目标文件（符号链接则替换其指向的文件），保留权限和属主"""
+        # 先校验编码，避免原地写入时打开即截断文件后才因编码无效而失败
+        codecs.lookup(encoding)
+        real_path = os.path.realpath(file_path)
+        st = os.stat(real_path)
+        # 替换会断开硬链接、丢失ACL，这类文件只能原地写入
+        if st.st_nlink > 1 or FileOption._has_posix_acl(real_path):
+            FileOption._write_text_in_place(real_path, content, encoding)
+            return
+
+        directory, name = os.path.split(real_path)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=directory, prefix=f".{name}.", suffix=".tmp"
+        )
+        try:
+            f = open(fd, "w", encoding=encoding, buffering=FILE_BUFFER_SIZE)
+        except BaseException:
+            # open失败时描述符仍归调用方所有
+            os.close(fd)
+            os.unlink(tmp_path)
+            raise
+
+        try:
+            with f:
+                owner_kept = FileOption._copy_owner(st, tmp_path)
+                if owner_kept:
+                    f.write(content)
+            if owner_kept:
+                shutil.copymode(real_path, tmp_path)
+                os.replace(tmp_path, real_path)
+                return
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        # 无法保留原属主时放弃替换，改为原地写入
+        os.unlink(tmp_path)
+        FileOption._write_text_in_place(real_path, content, encoding)
+
+    @staticmethod
+    def _write_text_in_place(file_path: str, content: str, encoding: str) -> None:
+        """直接覆盖写入文件，保留文件的inode及其所有元数据"""
+        with open(file_path, "w", encoding=encoding, buffering=FILE_BUFFER_SIZE) as f:
+            f.write(content)
+
+    @staticmethod
+    def _has_posix_acl(file_path: str) -> bool:
+        """判断文件是否带有POSIX ACL（不支持扩展属性的平台返回False）"""
+        if not hasattr(os, "listxattr"):
+            return False
+        try:
+            return any(
+                attr.startswith("system.posix_acl") for attr in os.listxattr(file_path)
+            )
+        except OSError:
+            return False
+
+    @staticmethod
+    def _copy_owner(st: os.stat_result, file_path: str) -> bool:
+        """将原文件的属主和属组应用到新文件，无法保留时返回False"""
+        if not hasattr(os, "chown"):
+            return True
+        try:
+            current = os.stat(file_path)
+            if (current.st_uid, current.st_gid) != (st.st_uid, st.st_gid):
+                os.chown(file_path, st.st_uid, st.st_gid)
+        except OSError:
+            return False
+        return True
+
     @staticmethod
     def create_directory(dir_path: str) -> Dict[str, Any]:
         """
@@ -169,8 +322,10 @@ class FileOption:
             Dict[str, Any]: 操作结果
         """
         try:
-            if os.path.exists(dir_path):
-                if os.path.isdir(dir_path):
+            # 一次stat同时判断是否存在及是否为目录
+            stat_info = FileOption._stat_path(dir_path)
+            if stat_info is not None:
+                if stat.S_ISDIR(stat_info.st_mode):
                     return {
                         "success": True,
                         "message": f"目录已存在: {dir_path}",
@@ -211,34 +366,40 @@ class FileOption:
             Dict[str, Any]: 操作结果
         """
         try:
-            if not os.path.exists(dir_path):
+            # 直接删除，由异常区分不存在、不是目录和目录非空的情况
+            try:
+                if force:
+                    shutil.rmtree(dir_path)
+                else:
+                    os.rmdir(dir_path)
+            except FileNotFoundError:
                 return {
                     "success": False,
                     "message": f"目录不存在: {dir_path}",
                     "path": dir_path,
                 }
-
-            if not os.path.isdir(dir_path):
+            except NotADirectoryError:
+                # 路径中间部分不是目录时同样报该错误
+                if not os.path.exists(dir_path):
+                    return {
+                        "success": False,
+                        "message": f"目录不存在: {dir_path}",
+                        "path": dir_path,
+                    }
                 return {
                     "success": False,
                     "message": f"路径不是目录: {dir_path}",
                     "path": dir_path,
                 }
-
-            # 检查目录是否为空
-            if not force and os.listdir(dir_path):
+            except OSError as e:
+                if e.errno not in (errno.ENOTEMPTY, errno.EEXIST):
+                    raise
                 return {
                     "success": False,
                     "message": f"目录不为空，请使用force=True强制删除: {dir_path}",
                     "path": dir_path,
                 }
 
-            # 删除目录
-            if force:
-                shutil.rmtree(dir_path)
-            else:
-                os.rmdir(dir_path)
-
             return {
                 "success": True,
                 "message": f"目录删除成功: {dir_path}",
@@ -264,43 +425,49 @@ class FileOption:
             Dict[str, Any]: 目录内容信息
         """
         try:
-            if not os.path.exists(dir_path):
+            stat_info = FileOption._stat_path(dir_path)
+            if stat_info is None:
                 return {
                     "success": False,
                     "message": f"目录不存在: {dir_path}",
                     "path": dir_path,
                 }
 
-            if not os.path.isdir(dir_path):
+            if not stat.S_ISDIR(stat_info.st_mode):
                 return {
                     "success": False,
                     "message": f"路径不是目录: {dir_path}",
                     "path": dir_path,
                 }
 
-            items = []
-            for item_name in os.listdir(dir_path):
-                # 跳过隐藏文件（除非指定显示）
-                if not show_hidden and item_name.startswith("."):
-                    continue
-
-                item_path = os.path.join(dir_path, item_name)
-                stat_info = os.stat(item_path)
-
-                item_info = {
-                    "name": item_name,
-                    "path": item_path,
-                    "is_directory": os.path.isdir(item_path),
-                    "size": stat_info.st_size if not os.path.isdir(item_path) else None,
-                    "modified_time": datetime.datetime.fromtimestamp(
-                        stat_info.st_mtime
-                    ).strftime("%Y-%m-%d %H:%M:%S"),
-                    "permissions": stat.filemode(stat_info.st_mode),
-                }
-                items.append(item_info)
+            # 排序键在遍历时一并生成：(非目录, 小写名称, 原名称, 条目信息)
+            decorated = []
+            # scandir一次读取目录项，类型和stat信息缓存在DirEntry中
+            with os.scandir(dir_path) as entries:
+                for entry in entries:
+                    name = entry.name
+                    # 跳过隐藏文件（除非指定显示）
+                    if not show_hidden and name.startswith("."):
+                        continue
+
+                    stat_info = entry.stat()
+                    is_directory = stat.S_ISDIR(stat_info.st_mode)
+
+                    item_info = {
+                        "name": name,
+                        "path": entry.path,
+                        "is_directory": is_directory,
+                        "size": None if is_directory else stat_info.st_size,
+                        "modified_time": _format_timestamp(
+                            stat_info.st_mtime_ns // 1_000_000_000
+                        ),
+                        "permissions": stat.filemode(stat_info.st_mode),
+                    }
+                    decorated.append((not is_directory, name.lower(), name, item_info))
 
-            # 按名称排序，目录在前
-            items.sort(key=lambda x: (not x["is_directory"], x["name"].lower()))
+            # 按名称排序，目录在前（名称唯一，比较不会落到条目信息上）
+            decorated.sort()
+            items = [item for *_, item in decorated]
 
             return {
                 "success": True,
@@ -329,7 +496,8 @@ class FileOption:
             Dict[str, Any]: 操作结果
         """
         try:
-            if not os.path.exists(source_path):
+            stat_info = FileOption._stat_path(source_path)
+            if stat_info is None:
                 return {
                     "success": False,
                     "message": f"源文件不存在: {source_path}",
@@ -337,7 +505,7 @@ class FileOption:
                     "destination": dest_path,
                 }
 
-            if os.path.isdir(source_path):
+            if stat.S_ISDIR(stat_info.st_mode):
                 return {
                     "success": False,
                     "message": f"源路径是目录而非文件: {source_path}",
@@ -346,10 +514,15 @@ class FileOption:
                 }
 
             # 确保目标目录存在
-            os.makedirs(os.path.dirname(os.path.abspath(dest_path)), exist_ok=True)
+            FileOption._ensure_parent_dir(dest_path)
+
+            # 目标是目录时复制到该目录下（与shutil.copy2一致）
+            if os.path.isdir(dest_path):
+                dest_path = os.path.join(dest_path, os.path.basename(source_path))
 
-            # 复制文件
-            shutil.copy2(source_path, dest_path)
+            # 复制文件内容，再单独复制权限和时间等元数据
+            FileOption._copy_file_data(source_path, dest_path)
+            shutil.copystat(source_path, dest_path)
 
             return {
                 "success": True,
@@ -378,7 +551,8 @@ class FileOption:
             Dict[str, Any]: 操作结果
         """
         try:
-            if not os.path.exists(source_path):
+            stat_info = FileOption._stat_path(source_path)
+            if stat_info is None:
                 return {
                     "success": False,
                     "message": f"源文件不存在: {source_path}",
@@ -386,7 +560,7 @@ class FileOption:
                     "destination": dest_path,
                 }
 
-            if os.path.isdir(source_path):
+            if stat.S_ISDIR(stat_info.st_mode):
                 return {
                     "success": False,
                     "message": f"源路径是目录而非文件: {source_path}",
@@ -395,10 +569,21 @@ class FileOption:
                 }
 
             # 确保目标目录存在
-            os.makedirs(os.path.dirname(os.path.abspath(dest_path)), exist_ok=True)
-
-            # 移动文件
-            shutil.move(source_path, dest_path)
+            FileOption._ensure_parent_dir(dest_path)
+
+            # 目标是目录时移动到该目录下（与shutil.move一致）
+            if os.path.isdir(dest_path):
+                dest_path = os.path.join(dest_path, os.path.basename(source_path))
+
+            # 同一文件系统内只需一次重命名，跨文件系统时复制后删除源文件
+            try:
+                os.replace(source_path, dest_path)
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                FileOption._copy_file_data(source_path, dest_path)
+                shutil.copystat(source_path, dest_path)
+                os.unlink(source_path)
 
             return {
                 "success": True,
@@ -426,23 +611,25 @@ class FileOption:
             Dict[str, Any]: 操作结果
         """
         try:
-            if not os.path.exists(file_path):
+            # 直接删除文件，由异常判断文件是否存在或是否为目录
+            try:
+                os.remove(file_path)
+            except _MISSING_PATH_ERRORS:
                 return {
                     "success": False,
                     "message": f"文件不存在: {file_path}",
                     "path": file_path,
                 }
-
-            if os.path.isdir(file_path):
+            except OSError:
+                # 删除目录失败时Linux报EISDIR，Windows报拒绝访问，需确认是否为目录
+                if not os.path.isdir(file_path):
+                    raise
                 return {
                     "success": False,
                     "message": f"路径是目录而非文件: {file_path}",
                     "path": file_path,
                 }
 
-            # 删除文件
-            os.remove(file_path)
-
             return {
                 "success": True,
                 "message": f"文件删除成功: {file_path}",
@@ -467,28 +654,29 @@ class FileOption:
             Dict[str, Any]: 文件信息
         """
         try:
-            if not os.path.exists(file_path):
+            try:
+                stat_info = os.stat(file_path)
+            except _MISSING_PATH_ERRORS:
                 return {
                     "success": False,
                     "message": f"文件不存在: {file_path}",
                     "path": file_path,
                 }
 
-            stat_info = os.stat(file_path)
             file_info = {
                 "path": file_path,
                 "name": os.path.basename(file_path),
                 "size": stat_info.st_size,
-                "is_directory": os.path.isdir(file_path),
-                "created_time": datetime.datetime.fromtimestamp(
-                    stat_info.st_ctime
-                ).strftime("%Y-%m-%d %H:%M:%S"),
-                "modified_time": datetime.datetime.fromtimestamp(
-                    stat_info.st_mtime
-                ).strftime("%Y-%m-%d %H:%M:%S"),
-                "accessed_time": datetime.datetime.fromtimestamp(
-                    stat_info.st_atime
-                ).strftime("%Y-%m-%d %H:%M:%S"),
+                "is_directory": stat.S_ISDIR(stat_info.st_mode),
+                "created_time": _format_timestamp(
+                    stat_info.st_ctime_ns // 1_000_000_000
+                ),
+                "modified_time": _format_timestamp(
+                    stat_info.st_mtime_ns // 1_000_000_000
+                ),
+                "accessed_time": _format_timestamp(
+                    stat_info.st_atime_ns // 1_000_000_000
+                ),
                 "permissions": stat.filemode(stat_info.st_mode),
                 "permissions_octal": oct(stat_info.st_mode)[-3:],
             }
@@ -519,19 +707,20 @@ class FileOption:
             Dict[str, Any]: 操作结果
         """
         try:
-            if not os.path.exists(file_path):
+            # 修改文件权限（直接修改，由异常判断文件是否存在）
+            try:
+                os.chmod(file_path, mode)
+            except _MISSING_PATH_ERRORS:
                 return {
                     "success": False,
                     "message": f"文件不存在: {file_path}",
                     "path": file_path,
                 }
 
-            # 修改文件权限
-            os.chmod(file_path, mode)
-
-            # 获取新的权限信息
-            new_permissions = stat.filemode(os.stat(file_path).st_mode)
-            new_permissions_octal = oct(os.stat(file_path).st_mode)[-3:]
+            # 获取新的权限信息（Windows只支持只读位，需以实际结果为准）
+            new_mode = os.stat(file_path).st_mode
+            new_permissions = stat.filemode(new_mode)
+            new_permissions_octal = oct(new_mode)[-3:]
 
             return {
                 "success": True,
@@ -8,8 +8,33 @@
 
 import os
 import platform
+import re
+from itertools import compress
 from typing import List, Tuple, Union
 
+# 运行平台在进程生命周期内不会改变，导入时判断一次
+_IS_WINDOWS = platform.system() == "Windows"
+
+# 合法绝对路径的开头：Windows为盘符加分隔符（C:\ 或 C:/），Unix/Linux为/
+_ABSOLUTE_PATH_PREFIX = re.compile(r"[A-Za-z]:[\\/]" if _IS_WINDOWS else "/")
+
+# 当前平台的路径格式示例
+_PATH_EXAMPLES = (
+    (
+        "C:\\Users\\用户名\\Documents\\file.txt",
+        "D:\\Projects\\MyProject\\src\\main.py",
+        "E:\\Data\\downloads\\",
+        "F:\\Scripts\\script.ps1",
+    )
+    if _IS_WINDOWS
+    else (
+        "/home/username/documents/file.txt",
+        "/opt/projects/myproject/src/main.py",
+        "/var/data/downloads/",
+        "/usr/local/scripts/script.sh",
+    )
+)
+
 
 class AbsolutePathValidator:
     """绝对路径验证器"""
@@ -40,26 +65,24 @@ class AbsolutePathValidator:
         if not path:
             return False, "路径不能为空"
 
+        # 格式正确的路径只需一次前缀匹配
+        if _ABSOLUTE_PATH_PREFIX.match(path):
+            return True, "路径格式正确"
+
+        # 以下仅在验证失败时区分错误原因
         if not AbsolutePathValidator.is_absolute_path(path):
             return False, f"必须使用绝对路径，当前输入: {path}"
 
-        # 检查路径格式
-        if platform.system() == "Windows":
-            # Windows路径检查 (C:\, D:\, etc.)
-            if not (len(path) >= 3 and path[1] == ":" and path[2] in ["\\", "/"]):
-                return (
-                    False,
-                    (
-                        f"Windows绝对路径格式错误，正确格式: C:\\path\\to\\file，"
-                        f"当前输入: {path}"
-                    ),
-                )
-        else:
-            # Unix/Linux路径检查
-            if not path.startswith("/"):
-                return False, f"Unix/Linux绝对路径必须以/开头，当前输入: {path}"
-
-        return True, "路径格式正确"
+        if _IS_WINDOWS:
+            # 如 \path 或 UNC 路径，不是以盘符开头 (C:\, D:\, etc.)
+            return (
+                False,
+                (
+                    f"Windows绝对路径格式错误，正确格式: C:\\path\\to\\file，"
+                    f"当前输入: {path}"
+                ),
+            )
+        return False, f"Unix/Linux绝对路径必须以/开头，当前输入: {path}"
 
     @staticmethod
     def validate_multiple_paths(
@@ -78,15 +101,16 @@ class AbsolutePathValidator:
         if isinstance(paths, str):
             paths = [paths]
 
-        valid_paths = []
-        invalid_paths = []
+        validate = AbsolutePathValidator.validate_path
+        checks = [validate(path, allow_none) for path in paths]
 
-        for path in paths:
-            is_valid, error_msg = AbsolutePathValidator.validate_path(path, allow_none)
-            if is_valid:
-                valid_paths.append(path)
-            else:
-                invalid_paths.append(f"{path}: {error_msg}")
+        # 按验证结果掩码筛选有效路径，无需逐个append
+        valid_paths = list(compress(paths, [is_valid for is_valid, _ in checks]))
+        invalid_paths = [
+            f"{path}: {error_msg}"
+            for path, (is_valid, error_msg) in zip(paths, checks)
+            if not is_valid
+        ]
 
         if invalid_paths:
             return False, "以下路径格式错误:\n" + "\n".join(invalid_paths), valid_paths
@@ -96,20 +120,7 @@ class AbsolutePathValidator:
     @staticmethod
     def get_path_examples() -> List[str]:
         """获取路径格式示例"""
-        if platform.system() == "Windows":
-            return [
-                "C:\\Users\\用户名\\Documents\\file.txt",
-                "D:\\Projects\\MyProject\\src\\main.py",
-                "E:\\Data\\downloads\\",
-                "F:\\Scripts\\script.ps1",
-            ]
-        else:
-            return [
-                "/home/username/documents/file.txt",
-                "/opt/projects/myproject/src/main.py",
-                "/var/data/downloads/",
-                "/usr/local/scripts/script.sh",
-            ]
+        return list(_PATH_EXAMPLES)
 
     @staticmethod
     def format_error_message(path: str, error_msg: str) -> str:
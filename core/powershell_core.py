@@ -8,12 +8,45 @@ PowerShell核心操作层
 """
 
 import asyncio
+import base64
 import logging
-import uuid
+import secrets
+from collections import deque
 from datetime import datetime
-from typing import Dict, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any
 import threading
 
+# 会话表分片数（须为2的幂），按会话ID哈希分片以降低锁竞争
+SESSION_SHARD_COUNT = 8
+
+# 每个会话输出缓冲区保留的最大条目数，超出后丢弃最早的输出
+OUTPUT_BUFFER_MAX_ENTRIES = 1000
+
+# 常驻进程中标记命令结束的输出前缀（后接随机串）
+_END_MARKER_PREFIX = "__AI_TOOL_MCP_END_"
+
+# 常驻进程stdout/stderr缓冲上限，常见输出可一次readuntil读完而无需分段
+PIPE_READ_LIMIT = 1024 * 1024
+
+# 超时上下文（可选）：优先asyncio.timeout（3.11+），其次async_timeout，否则退回wait_for
+try:
+    from asyncio import timeout as async_timeout
+    ASYNC_TIMEOUT_AVAILABLE = True
+except ImportError:
+    try:
+        from async_timeout import timeout as async_timeout
+        ASYNC_TIMEOUT_AVAILABLE = True
+    except ImportError:
+        ASYNC_TIMEOUT_AVAILABLE = False
+
+
+async def _await_with_timeout(awaitable, seconds: float):
+    """带超时等待，避免wait_for为每次调用额外创建Task"""
+    if ASYNC_TIMEOUT_AVAILABLE:
+        async with async_timeout(seconds):
+            return await awaitable
+    return await asyncio.wait_for(awaitable, timeout=seconds)
+
 
 class PowerShellSession:
     """PowerShell会话信息"""
@@ -22,29 +55,27 @@ class PowerShellSession:
         self.session_id = session_id
         self.working_dir = working_dir or "C:\\"
         self.process: Optional[asyncio.subprocess.Process] = None
+        # 常驻进程所属的事件循环、执行权锁及超时后仍在读取的后台任务
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.io_lock: Optional[asyncio.Lock] = None
+        self.pending_task: Optional[asyncio.Future] = None
         self.created_at = datetime.now()
         self.last_command = ""
-        self.output_buffer = []
+        self.output_buffer = deque(maxlen=OUTPUT_BUFFER_MAX_ENTRIES)
         self.is_active = False
-        self.lock = threading.Lock()
     
+    # GUI线程也会写入缓冲区，但deque的append/clear及join在GIL下均为原子操作，无需加锁
     def add_output(self, output: str):
         """添加输出到缓冲区"""
-        with self.lock:
-            self.output_buffer.append({
-                "timestamp": datetime.now().isoformat(),
-                "content": output
-            })
+        self.output_buffer.append(output)
     
     def get_full_output(self) -> str:
         """获取完整输出"""
-        with self.lock:
-            return "\n".join([item["content"] for item in self.output_buffer])
+        return "\n".join(self.output_buffer)
     
     def clear_output(self):
         """清空输出缓冲区"""
-        with self.lock:
-            self.output_buffer.clear()
+        self.output_buffer.clear()
 
 
 class PowerShellCore:
@@ -52,32 +83,51 @@ class PowerShellCore:
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self.sessions: Dict[str, PowerShellSession] = {}
         self.powershell_path = "C:\\Program Files\\PowerShell\\7\\pwsh.exe"
-        self.session_lock = threading.Lock()
+
+        # 会话表分片存储，每个分片独立加锁
+        self._shards: List[Dict[str, PowerShellSession]] = [
+            {} for _ in range(SESSION_SHARD_COUNT)
+        ]
+        self._shard_locks = [threading.Lock() for _ in range(SESSION_SHARD_COUNT)]
         
         self.logger.info("PowerShell核心操作层初始化完成")
 
+    def _shard(
+        self, session_id: str
+    ) -> Tuple[Dict[str, PowerShellSession], threading.Lock]:
+        """获取会话ID所在的分片及其锁"""
+        index = hash(session_id) & (SESSION_SHARD_COUNT - 1)
+        return self._shards[index], self._shard_locks[index]
+
+    def _get_session(self, session_id: str) -> Optional[PowerShellSession]:
+        """查找会话（单次dict读取为原子操作，无需加锁）"""
+        shard, _ = self._shard(session_id)
+        return shard.get(session_id)
+
     def _decode_output(self, output_bytes: bytes) -> str:
-        """解码PowerShell输出，尝试多种编码方式"""
+        """解码PowerShell输出（UTF-8优先，GBK兜底）"""
         if not output_bytes:
             return ""
 
-        # 尝试的编码顺序：UTF-8, GBK, CP936, Latin-1
-        encodings = ['utf-8', 'gbk', 'cp936', 'latin-1']
-
-        for encoding in encodings:
-            try:
-                return output_bytes.decode(encoding)
-            except UnicodeDecodeError:
-                continue
+        # 绝大多数输出为UTF-8，一次解码即可；失败时退回GBK（CP936为其别名）
+        try:
+            return output_bytes.decode('utf-8')
+        except UnicodeDecodeError:
+            return output_bytes.decode('gbk', errors='replace')
 
-        # 如果所有编码都失败，使用UTF-8并忽略错误
-        return output_bytes.decode('utf-8', errors='ignore')
+    def _format_output(self, stdout: bytes, stderr: bytes) -> str:
+        """合并标准输出和错误输出，错误输出单独标注"""
+        output = self._decode_output(stdout).strip()
+        if stderr:
+            error_output = self._decode_output(stderr).strip()
+            if error_output:
+                output += f"\n错误: {error_output}"
+        return output
 
     def create_session_id(self) -> str:
         """创建新的会话ID"""
-        return uuid.uuid4().hex
+        return secrets.token_hex(16)
     
     async def create_session(self, working_dir: str = None) -> str:
         """
@@ -91,11 +141,14 @@ class PowerShellCore:
         """
         session_id = self.create_session_id()
         
-        with self.session_lock:
-            session = PowerShellSession(session_id, working_dir)
-            self.sessions[session_id] = session
+        session = PowerShellSession(session_id, working_dir)
+        shard, lock = self._shard(session_id)
+        with lock:
+            shard[session_id] = session
         
-        self.logger.info(f"创建PowerShell会话: {session_id}, 工作目录: {working_dir}")
+        self.logger.info(
+            "创建PowerShell会话: %s, 工作目录: %s", session_id, working_dir
+        )
         return session_id
     
     async def execute_command(self, session_id: str, command: str, timeout: int = 3) -> Dict[str, Any]:
@@ -111,44 +164,26 @@ class PowerShellCore:
             Dict[str, Any]: 执行结果
         """
         try:
-            if session_id not in self.sessions:
+            session = self._get_session(session_id)
+            if session is None:
                 return {
                     "success": False,
                     "error": f"会话 {session_id} 不存在",
                     "session_id": session_id
                 }
 
-            session = self.sessions[session_id]
             session.last_command = command
 
-            # 使用简单的subprocess执行命令
-            self.logger.info(f"会话 {session_id} 执行命令: {command}")
+            self.logger.info("会话 %s 执行命令: %s", session_id, command)
 
             try:
-                # 直接执行命令，不使用持久进程
-                process = await asyncio.create_subprocess_exec(
-                    self.powershell_path,
-                    "-NoLogo",
-                    "-NoProfile",
-                    "-ExecutionPolicy", "Bypass",
-                    "-Command", command,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
-                    cwd=session.working_dir
-                )
-
-                # 等待命令完成（带超时）
-                stdout, stderr = await asyncio.wait_for(
-                    process.communicate(),
-                    timeout=timeout
-                )
-
-                # 尝试多种编码方式解码输出
-                output = self._decode_output(stdout).strip()
-                if stderr:
-                    error_output = self._decode_output(stderr).strip()
-                    if error_output:
-                        output += f"\n错误: {error_output}"
+                # 优先复用会话的常驻进程；不可用或正忙时单独启动进程执行
+                if await self._acquire_session_process(session):
+                    output = await self._run_in_session_process(
+                        session, command, timeout
+                    )
+                else:
+                    output = await self._run_one_shot(session, command, timeout)
 
                 # 添加到输出缓冲区
                 session.add_output(f"PS> {command}\n{output}")
@@ -175,59 +210,186 @@ class PowerShellCore:
 
         except Exception as e:
             error_msg = f"执行命令失败: {str(e)}"
-            self.logger.error(f"会话 {session_id} {error_msg}")
+            self.logger.error("会话 %s %s", session_id, error_msg)
             return {
                 "success": False,
                 "error": error_msg,
                 "session_id": session_id
             }
     
+    async def _run_one_shot(
+        self, session: PowerShellSession, command: str, timeout: int
+    ) -> str:
+        """单独启动一个PowerShell进程执行命令"""
+        process = await asyncio.create_subprocess_exec(
+            self.powershell_path,
+            "-NoLogo",
+            "-NoProfile",
+            "-ExecutionPolicy", "Bypass",
+            "-Command", command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=session.working_dir
+        )
+
+        # 等待命令完成（带超时）
+        stdout, stderr = await _await_with_timeout(process.communicate(), timeout)
+        return self._format_output(stdout, stderr)
+
+    async def _acquire_session_process(self, session: PowerShellSession) -> bool:
+        """
+        获取会话常驻进程的执行权，必要时启动进程
+
+        Returns:
+            bool: 获取成功返回True；非主线程、进程正忙、属于其他事件循环或无法启动时返回False
+        """
+        # 常驻进程只在主线程长期运行的服务事件循环中使用。GUI线程为每条命令新建并关闭
+        # 临时事件循环，若绑定常驻进程，每条命令都会重启进程并丢弃仍在读取的后台任务
+        if threading.current_thread() is not threading.main_thread():
+            return False
+
+        loop = asyncio.get_running_loop()
+        if session.loop is not loop:
+            # 进程流只能在创建它的事件循环中使用，原循环已关闭时才重新绑定
+            if session.loop is not None and not session.loop.is_closed():
+                return False
+            self._discard_session_process(session)
+            session.loop = loop
+            session.io_lock = asyncio.Lock()
+
+        if session.io_lock.locked():
+            return False
+        await session.io_lock.acquire()
+
+        process = session.process
+        if process is None or process.returncode is not None or process.stdout.at_eof():
+            # 首次使用或进程已退出（如命令中执行了exit）时重新启动
+            try:
+                await self._start_session_process(session)
+            except Exception as e:
+                session.io_lock.release()
+                self.logger.warning("会话 %s 常驻进程不可用: %s", session.session_id, e)
+                return False
+        return True
+
+    async def _run_in_session_process(
+        self, session: PowerShellSession, command: str, timeout: int
+    ) -> str:
+        """在常驻进程中执行命令，读取到结束标记为止（调用前须已获取执行权）"""
+        process = session.process
+        marker = f"{_END_MARKER_PREFIX}{secrets.token_hex(8)}__"
+        # 命令以Base64传递，避免多行命令和控制台输入编码问题
+        encoded = base64.b64encode(command.encode("utf-8")).decode("ascii")
+        script = (
+            "Invoke-Expression ([System.Text.Encoding]::UTF8.GetString("
+            f"[System.Convert]::FromBase64String('{encoded}')))\n"
+            f"Write-Output '{marker}'\n"
+            f"[Console]::Error.WriteLine('{marker}')\n"
+        )
+
+        try:
+            process.stdin.write(script.encode("ascii"))
+            await process.stdin.drain()
+        except Exception:
+            self._discard_session_process(session)
+            session.io_lock.release()
+            raise
+
+        # stdout和stderr分别读到结束标记，两者同时读取以免任一管道写满阻塞进程
+        marker_bytes = marker.encode("ascii")
+        reader = asyncio.gather(
+            self._read_until_marker(process.stdout, marker_bytes),
+            self._read_until_marker(process.stderr, marker_bytes),
+        )
+        try:
+            stdout, stderr = await _await_with_timeout(asyncio.shield(reader), timeout)
+        except BaseException:
+            if reader.done():
+                session.io_lock.release()
+            else:
+                # 命令仍在执行，交由后台任务读完输出后再释放执行权
+                session.pending_task = asyncio.ensure_future(
+                    self._finish_pending_command(session, command, reader)
+                )
+            raise
+
+        session.io_lock.release()
+        return self._format_output(stdout, stderr)
+
+    async def _finish_pending_command(
+        self, session: PowerShellSession, command: str, reader: asyncio.Future
+    ):
+        """后台读取超时命令的剩余输出并写入缓冲区"""
+        try:
+            stdout, stderr = await reader
+            session.add_output(
+                f"[命令执行完成] {command}\n{self._format_output(stdout, stderr)}"
+            )
+        except Exception as e:
+            self.logger.warning("会话 %s 读取后台输出失败: %s", session.session_id, e)
+        finally:
+            session.pending_task = None
+            session.io_lock.release()
+
+    def _discard_session_process(self, session: PowerShellSession):
+        """终止并丢弃会话的常驻进程"""
+        process = session.process
+        session.process = None
+        session.is_active = False
+        if process is not None and process.returncode is None:
+            try:
+                process.terminate()
+            except Exception as e:
+                self.logger.warning("终止会话 %s 进程失败: %s", session.session_id, e)
+
     async def _start_session_process(self, session: PowerShellSession):
-        """启动会话的PowerShell进程"""
+        """启动会话的常驻PowerShell进程，从标准输入逐行读取命令"""
         try:
-            # 启动PowerShell进程 - 使用交互式模式
             session.process = await asyncio.create_subprocess_exec(
                 self.powershell_path,
                 "-NoLogo",
                 "-NoProfile",
+                "-NonInteractive",
                 "-ExecutionPolicy", "Bypass",
-                "-Interactive",
+                "-Command", "-",
                 stdin=asyncio.subprocess.PIPE,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
-                cwd=session.working_dir
+                cwd=session.working_dir,
+                limit=PIPE_READ_LIMIT
             )
 
-            # 设置工作目录
-            if session.working_dir:
-                init_command = f"Set-Location '{session.working_dir}'\n"
-                session.process.stdin.write(init_command.encode('utf-8'))
-                await session.process.stdin.drain()
+            # 统一输出为无BOM的UTF-8，使解码走快速路径
+            session.process.stdin.write(
+                b"[Console]::OutputEncoding = [System.Text.UTF8Encoding]::new($false)\n"
+            )
+            await session.process.stdin.drain()
 
             session.is_active = True
-            self.logger.info(f"会话 {session.session_id} PowerShell进程启动成功")
+            self.logger.info("会话 %s PowerShell进程启动成功", session.session_id)
 
         except Exception as e:
             error_msg = f"启动PowerShell进程失败: {str(e)}"
             self.logger.error(error_msg)
             raise Exception(error_msg)
     
-    async def _read_output_until_prompt(self, process: asyncio.subprocess.Process) -> str:
-        """读取输出（简化版本）"""
-        try:
-            # 简单读取一定量的输出
-            output_data = await asyncio.wait_for(
-                process.stdout.read(4096),
-                timeout=2.0
-            )
-            if output_data:
-                return output_data.decode('utf-8', errors='ignore').strip()
-            return ""
-        except asyncio.TimeoutError:
-            return "命令执行中..."
-        except Exception as e:
-            self.logger.warning(f"读取输出时出错: {e}")
-            return f"读取输出错误: {str(e)}"
+    async def _read_until_marker(
+        self, stream: asyncio.StreamReader, marker: bytes
+    ) -> bytes:
+        """读取常驻进程的一个输出流直到结束标记，返回标记之前的内容"""
+        chunks = []
+        while True:
+            try:
+                chunks.append(await stream.readuntil(marker))
+                break
+            except asyncio.LimitOverrunError as e:
+                # 超出StreamReader缓冲上限时先取走不含标记的部分
+                chunks.append(await stream.readexactly(e.consumed))
+            except asyncio.IncompleteReadError as e:
+                # 进程提前退出，返回已读到的输出
+                chunks.append(e.partial)
+                return b"".join(chunks)
+        return b"".join(chunks)[:-len(marker)]
     
     async def get_session_output(self, session_id: str) -> Dict[str, Any]:
         """
@@ -240,13 +402,13 @@ class PowerShellCore:
             Dict[str, Any]: 输出结果
         """
         try:
-            if session_id not in self.sessions:
+            session = self._get_session(session_id)
+            if session is None:
                 return {
                     "success": False,
                     "error": f"会话 {session_id} 不存在"
                 }
             
-            session = self.sessions[session_id]
             output = session.get_full_output()
             
             return {
@@ -291,24 +453,22 @@ class PowerShellCore:
             Dict[str, Any]: 关闭结果
         """
         try:
-            if session_id not in self.sessions:
+            # 从所在分片中移除（pop保证并发关闭时只有一方成功）
+            shard, lock = self._shard(session_id)
+            with lock:
+                session = shard.pop(session_id, None)
+            if session is None:
                 return {
                     "success": False,
                     "error": f"会话 {session_id} 不存在"
                 }
             
-            session = self.sessions[session_id]
-            
-            # 终止进程
+            # 终止常驻进程
             if session.process and session.process.returncode is None:
-                session.process.terminate()
-                self.logger.info(f"终止会话 {session_id} 的PowerShell进程")
-            
-            # 从会话字典中移除
-            with self.session_lock:
-                del self.sessions[session_id]
+                self._discard_session_process(session)
+                self.logger.info("终止会话 %s 的PowerShell进程", session_id)
             
-            self.logger.info(f"会话 {session_id} 已关闭")
+            self.logger.info("会话 %s 已关闭", session_id)
             
             return {
                 "success": True,
@@ -332,18 +492,23 @@ class PowerShellCore:
             Dict[str, Any]: 会话列表
         """
         try:
-            sessions_info = []
-            
-            with self.session_lock:
-                for session_id, session in self.sessions.items():
-                    sessions_info.append({
-                        "session_id": session_id,
-                        "working_dir": session.working_dir,
-                        "created_at": session.created_at.isoformat(),
-                        "last_command": session.last_command,
-                        "is_active": session.is_active,
-                        "output_lines": len(session.output_buffer)
-                    })
+            # 逐个分片加锁仅复制会话引用（任一时刻只持有一把锁），格式化在锁外进行
+            items = []
+            for shard, lock in zip(self._shards, self._shard_locks):
+                with lock:
+                    items.extend(shard.items())
+
+            sessions_info = [
+                {
+                    "session_id": session_id,
+                    "working_dir": session.working_dir,
+                    "created_at": session.created_at.isoformat(),
+                    "last_command": session.last_command,
+                    "is_active": session.is_active,
+                    "output_lines": len(session.output_buffer)
+                }
+                for session_id, session in items
+            ]
             
             return {
                 "success": True,
@@ -8,11 +8,16 @@
 
 import logging
 import platform
+import re
+import socket
 import subprocess
+import threading
 import time
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict
+from itertools import islice
+from typing import Any, Dict, List, Optional, Tuple
 
 import psutil
 
@@ -25,6 +30,36 @@ try:
 except ImportError:
     GPU_AVAILABLE = False
 
+# CPU使用率两次采样的最小间隔（秒），间隔过短时结果不可靠
+CPU_SAMPLE_MIN_INTERVAL = 0.2
+
+# 单项使用率状态，下标为越过的阈值个数（警告阈值、危险阈值）
+_USAGE_STATUS = ("正常", "警告", "危险")
+
+# 无线网卡名称关键字
+_WIFI_INTERFACE_PATTERN = re.compile(r"wi-fi|wlan|wireless", re.IGNORECASE)
+
+# 主要网络接口的名称优先级（小写）：以太网 > Wi-Fi > 其他
+_PRIMARY_INTERFACE_PRIORITY = ("以太网", "ethernet", "wi-fi", "wlan", "wlan0", "eth0")
+
+# 网络状态中最多返回的连接数
+MAX_CONNECTIONS = 50
+
+# 网关信息缓存时间（秒）
+GATEWAY_CACHE_TTL = 30
+
+# Linux路由表中表示"经由网关"的标志位
+_RTF_GATEWAY = 0x2
+
+# 字节单位表，下标为 (bit_length - 1) // 10，即以1024为底的数量级
+_BYTE_UNITS = (
+    ("B", 1),
+    ("KB", 1024),
+    ("MB", 1024**2),
+    ("GB", 1024**3),
+    ("TB", 1024**4),
+)
+
 
 class SystemMonitor:
     """系统监控器，提供全面的系统信息获取功能"""
@@ -34,8 +69,63 @@ class SystemMonitor:
         self._dev_env_cache = None
         self._cache_timestamp = None
         self._cache_ttl = 300  # 缓存5分钟
+
+        # CPU核心数和平台信息在进程生命周期内不变，初始化时获取一次
+        self._cpu_count_physical = psutil.cpu_count(logical=False)
+        self._cpu_count_logical = psutil.cpu_count(logical=True)
+        self._platform_info = {
+            "platform": platform.platform(),
+            "system": platform.system(),
+            "release": platform.release(),
+            "version": platform.version(),
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "architecture": platform.architecture(),
+            "hostname": platform.node(),
+        }
+
+        # 系统启动时间不变，首次查询后缓存（时间戳及其ISO格式）
+        self._boot_time: Optional[Tuple[float, str]] = None
+
+        # 网关信息缓存：(获取时的单调时钟, 网关地址)
+        self._gateway_cache: Optional[Tuple[float, Optional[str]]] = None
+
+        # 非阻塞CPU采样：先调用一次建立基准，之后返回与上次采样之间的使用率
+        psutil.cpu_percent(interval=None)
+        self._cpu_sample_time = time.monotonic()
+        self._cpu_percent = None
+        # psutil的非阻塞采样共享全局基准，并发采样需串行化
+        self._cpu_lock = threading.Lock()
+
+        # 并行执行相互独立的阻塞查询（psutil调用期间会释放GIL）
+        self._executor = ThreadPoolExecutor(
+            max_workers=3, thread_name_prefix="system_monitor"
+        )
         self.logger.info("系统监控器初始化完成")
 
+    def _sample_cpu_percent(self) -> float:
+        """
+        获取CPU使用率，不再为每次调用阻塞1秒
+
+        返回值是自上次采样以来的平均使用率：距上次调用越久，平均的时间窗口越长，
+        不一定反映当前瞬时负载
+        """
+        with self._cpu_lock:
+            elapsed = time.monotonic() - self._cpu_sample_time
+            if elapsed < CPU_SAMPLE_MIN_INTERVAL:
+                if self._cpu_percent is not None:
+                    return self._cpu_percent
+                # 首次采样距基准过近，补足最小间隔
+                time.sleep(CPU_SAMPLE_MIN_INTERVAL - elapsed)
+
+            self._cpu_percent = psutil.cpu_percent(interval=None)
+            self._cpu_sample_time = time.monotonic()
+            return self._cpu_percent
+
+    def close(self) -> None:
+        """关闭并行查询使用的线程池"""
+        self._executor.shutdown()
+
     def get_system_status(self) -> Dict[str, Any]:
         """
         获取系统实时状态信息
@@ -45,9 +135,7 @@ class SystemMonitor:
         """
         try:
             # CPU信息
-            cpu_percent = psutil.cpu_percent(interval=1)
-            cpu_count = psutil.cpu_count()
-            cpu_count_logical = psutil.cpu_count(logical=True)
+            cpu_percent = self._sample_cpu_percent()
 
             # 内存信息
             memory = psutil.virtual_memory()
@@ -60,8 +148,8 @@ class SystemMonitor:
                 "timestamp": datetime.now().isoformat(),
                 "cpu": {
                     "percent": cpu_percent,
-                    "count_physical": cpu_count,
-                    "count_logical": cpu_count_logical,
+                    "count_physical": self._cpu_count_physical,
+                    "count_logical": self._cpu_count_logical,
                 },
                 "memory": {
                     "total": memory.total,
@@ -91,7 +179,7 @@ class SystemMonitor:
                 },
             }
         except Exception as e:
-            self.logger.error("获取系统状态失败: {e}")
+            self.logger.error("获取系统状态失败: %s", e)
             return {"error": str(e)}
 
     def get_hardware_info(self) -> Dict[str, Any]:
@@ -102,22 +190,13 @@ class SystemMonitor:
             Dict[str, Any]: 硬件信息
         """
         try:
-            # 基本系统信息
-            system_info = {
-                "platform": platform.platform(),
-                "system": platform.system(),
-                "release": platform.release(),
-                "version": platform.version(),
-                "machine": platform.machine(),
-                "processor": platform.processor(),
-                "architecture": platform.architecture(),
-                "hostname": platform.node(),
-            }
+            # 基本系统信息（复制缓存，避免调用方修改影响后续结果）
+            system_info = dict(self._platform_info)
 
             # CPU详细信息
             cpu_info = {
-                "physical_cores": psutil.cpu_count(logical=False),
-                "logical_cores": psutil.cpu_count(logical=True),
+                "physical_cores": self._cpu_count_physical,
+                "logical_cores": self._cpu_count_logical,
                 "max_frequency": None,
                 "min_frequency": None,
                 "current_frequency": None,
@@ -190,7 +269,7 @@ class SystemMonitor:
                 "timestamp": datetime.now().isoformat(),
             }
         except Exception as e:
-            self.logger.error("获取硬件信息失败: {e}")
+            self.logger.error("获取硬件信息失败: %s", e)
             return {"error": str(e)}
 
     def _get_gpu_info(self) -> Dict[str, Any]:
@@ -224,20 +303,33 @@ class SystemMonitor:
                 "gpus": gpu_list,
             }
         except Exception as e:
-            self.logger.warning("获取GPU信息失败: {e}")
+            self.logger.warning("获取GPU信息失败: %s", e)
             return {"available": False, "error": str(e)}
 
-    def get_network_status(self) -> Dict[str, Any]:
+    def get_network_status(
+        self,
+        if_addrs: Optional[Dict[str, List[Any]]] = None,
+        if_stats: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
         """
         获取网络状态信息
 
+        Args:
+            if_addrs: 预先获取的psutil.net_if_addrs()结果，为None时自动获取
+            if_stats: 预先获取的psutil.net_if_stats()结果，为None时自动获取
+
         Returns:
             Dict[str, Any]: 网络状态信息
         """
         try:
+            if if_addrs is None:
+                if_addrs = psutil.net_if_addrs()
+            if if_stats is None:
+                if_stats = psutil.net_if_stats()
+
             # 网络接口信息
             network_interfaces = {}
-            for interface_name, addresses in psutil.net_if_addrs().items():
+            for interface_name, addresses in if_addrs.items():
                 interface_info = {
                     "addresses": [],
                     "stats": None,
@@ -255,7 +347,7 @@ class SystemMonitor:
 
                 # 接口统计信息
                 try:
-                    stats = psutil.net_if_stats()[interface_name]
+                    stats = if_stats[interface_name]
                     interface_info["stats"] = {
                         "isup": stats.isup,
                         "duplex": str(stats.duplex),
@@ -283,13 +375,16 @@ class SystemMonitor:
             # 网络连接信息
             connections = []
             try:
-                for conn in psutil.net_connections(kind="inet"):
+                # 只为需要返回的前MAX_CONNECTIONS个连接构建结果
+                for conn in islice(
+                    psutil.net_connections(kind="inet"), MAX_CONNECTIONS
+                ):
                     connection_info = {
                         "fd": conn.fd,
                         "family": str(conn.family),
                         "type": str(conn.type),
                         "local_address": (
-                            "{conn.laddr.ip}:{conn.laddr.port}" if conn.laddr else None
+                            f"{conn.laddr.ip}:{conn.laddr.port}" if conn.laddr else None
                         ),
                         "remote_address": (
                             f"{conn.raddr.ip}:{conn.raddr.port}" if conn.raddr else None
@@ -306,11 +401,11 @@ class SystemMonitor:
             return {
                 "interfaces": network_interfaces,
                 "io_stats": network_io_stats,
-                "connections": connections[:50],  # 限制连接数量避免过多数据
+                "connections": connections,
                 "timestamp": datetime.now().isoformat(),
             }
         except Exception as e:
-            self.logger.error("获取网络状态失败: {e}")
+            self.logger.error("获取网络状态失败: %s", e)
             return {"error": str(e)}
 
     def get_process_info(self, limit: int = 10) -> Dict[str, Any]:
@@ -325,17 +420,24 @@ class SystemMonitor:
         """
         try:
             processes = []
+            # memory_info随其他属性在同一次oneshot中读取，无需再逐进程单独查询
             for proc in psutil.process_iter(
-                ["pid", "name", "cpu_percent", "memory_percent", "status"]
+                [
+                    "pid",
+                    "name",
+                    "cpu_percent",
+                    "memory_percent",
+                    "status",
+                    "memory_info",
+                ]
             ):
-                try:
-                    process_info = proc.info
-                    process_info["memory_mb"] = round(
-                        proc.memory_info().rss / (1024 * 1024), 2
-                    )
-                    processes.append(process_info)
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    pass
+                process_info = proc.info
+                memory_info = process_info.pop("memory_info")
+                if memory_info is None:
+                    # 无权限读取内存信息的进程（与原先AccessDenied时一致）跳过
+                    continue
+                process_info["memory_mb"] = round(memory_info.rss / (1024 * 1024), 2)
+                processes.append(process_info)
 
             # 按CPU使用率排序
             processes.sort(key=lambda x: x.get("cpu_percent", 0), reverse=True)
@@ -346,25 +448,30 @@ class SystemMonitor:
                 "timestamp": datetime.now().isoformat(),
             }
         except Exception as e:
-            self.logger.error("获取进程信息失败: {e}")
+            self.logger.error("获取进程信息失败: %s", e)
             return {"error": str(e)}
 
     def get_boot_time(self) -> Dict[str, Any]:
         """获取系统启动时间"""
         try:
-            boot_timestamp = psutil.boot_time()
-            boot_time = datetime.fromtimestamp(boot_timestamp)
+            if self._boot_time is None:
+                boot_timestamp = psutil.boot_time()
+                self._boot_time = (
+                    boot_timestamp,
+                    datetime.fromtimestamp(boot_timestamp).isoformat(),
+                )
+            boot_timestamp, boot_time = self._boot_time
             uptime_seconds = time.time() - boot_timestamp
 
             return {
-                "boot_time": boot_time.isoformat(),
+                "boot_time": boot_time,
                 "boot_timestamp": boot_timestamp,
                 "uptime_seconds": uptime_seconds,
                 "uptime_hours": round(uptime_seconds / 3600, 2),
                 "uptime_days": round(uptime_seconds / 86400, 2),
             }
         except Exception as e:
-            self.logger.error("获取启动时间失败: {e}")
+            self.logger.error("获取启动时间失败: %s", e)
             return {"error": str(e)}
 
     def _format_bytes_to_readable(self, bytes_value: int) -> str:
@@ -377,19 +484,13 @@ class SystemMonitor:
         Returns:
             str: 格式化后的字符串，如 "8 GB", "512 MB"
         """
-        if bytes_value == 0:
-            return "0 B"
-
         if bytes_value < 1024:
             return f"{bytes_value} B"
-        elif bytes_value < 1024 * 1024:
-            return f"{bytes_value / 1024:.1f} KB"
-        elif bytes_value < 1024 * 1024 * 1024:
-            return f"{bytes_value / (1024 * 1024):.1f} MB"
-        elif bytes_value < 1024 * 1024 * 1024 * 1024:
-            return f"{bytes_value / (1024 * 1024 * 1024):.1f} GB"
-        else:
-            return f"{bytes_value / (1024 * 1024 * 1024 * 1024):.1f} TB"
+
+        # 按数量级直接查表，TB及以上统一用TB
+        index = min((bytes_value.bit_length() - 1) // 10, len(_BYTE_UNITS) - 1)
+        unit, divisor = _BYTE_UNITS[index]
+        return f"{bytes_value / divisor:.1f} {unit}"
 
     def _format_uptime_to_readable(self, seconds: float) -> str:
         """
@@ -444,62 +545,79 @@ class SystemMonitor:
         # 良好状态
         return "良好"
 
-    def _get_primary_network_interface(self) -> Dict[str, Any]:
+    def _get_interface_type(self, interface_name: str) -> str:
+        """根据接口名称判断有线/无线网络"""
+        if _WIFI_INTERFACE_PATTERN.search(interface_name):
+            return "无线网络"
+        return "有线网络"
+
+    def _get_primary_network_interface(
+        self,
+        interfaces: Optional[Dict[str, List[Any]]] = None,
+        stats: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
         """
         获取主要网络接口信息
 
+        Args:
+            interfaces: 预先获取的psutil.net_if_addrs()结果，为None时自动获取
+            stats: 预先获取的psutil.net_if_stats()结果，为None时自动获取
+
         Returns:
             Dict[str, Any]: 主要网络接口信息
         """
         try:
-            interfaces = psutil.net_if_addrs()
-            stats = psutil.net_if_stats()
-
-            # 优先级：以太网 > Wi-Fi > 其他
-            priority_names = ["以太网", "Ethernet", "Wi-Fi", "WLAN", "wlan0", "eth0"]
-
-            # 查找优先级最高的活跃接口
-            for priority_name in priority_names:
-                for interface_name in interfaces.keys():
-                    if priority_name.lower() in interface_name.lower():
-                        if interface_name in stats and stats[interface_name].isup:
-                            # 获取IPv4地址
-                            ipv4_addr = None
-                            mac_addr = None
-                            for addr in interfaces[interface_name]:
-                                if addr.family.name == "AF_INET":
-                                    ipv4_addr = addr.address
-                                elif addr.family.name == "AF_LINK":
-                                    mac_addr = addr.address
-
-                            if ipv4_addr:  # 只返回有IP地址的接口
-                                return {
-                                    "name": interface_name,
-                                    "ip_address": ipv4_addr,
-                                    "mac_address": mac_addr,
-                                    "is_up": stats[interface_name].isup,
-                                    "speed": stats[interface_name].speed,
-                                }
-
-            # 如果没找到优先接口，返回第一个活跃的接口
+            if interfaces is None:
+                interfaces = psutil.net_if_addrs()
+            if stats is None:
+                stats = psutil.net_if_stats()
+
+            # 单次遍历活跃接口，按名称命中的最高优先级选取；均未命中时取第一个活跃接口
+            no_match_rank = len(_PRIMARY_INTERFACE_PRIORITY)
+            best_rank = no_match_rank + 1
+            primary = None
             for interface_name, addresses in interfaces.items():
-                if interface_name in stats and stats[interface_name].isup:
-                    ipv4_addr = None
-                    mac_addr = None
-                    for addr in addresses:
-                        if addr.family.name == "AF_INET":
-                            ipv4_addr = addr.address
-                        elif addr.family.name == "AF_LINK":
-                            mac_addr = addr.address
-
-                    if ipv4_addr:
-                        return {
-                            "name": interface_name,
-                            "ip_address": ipv4_addr,
-                            "mac_address": mac_addr,
-                            "is_up": stats[interface_name].isup,
-                            "speed": stats[interface_name].speed,
-                        }
+                interface_stats = stats.get(interface_name)
+                if interface_stats is None or not interface_stats.isup:
+                    continue
+
+                lowered_name = interface_name.lower()
+                rank = next(
+                    (
+                        index
+                        for index, priority_name in enumerate(
+                            _PRIMARY_INTERFACE_PRIORITY
+                        )
+                        if priority_name in lowered_name
+                    ),
+                    no_match_rank,
+                )
+                if rank >= best_rank:
+                    continue  # 同等优先级保留先出现的接口
+
+                # 获取IPv4地址
+                ipv4_addr = None
+                mac_addr = None
+                for addr in addresses:
+                    if addr.family.name == "AF_INET":
+                        ipv4_addr = addr.address
+                    elif addr.family.name == "AF_LINK":
+                        mac_addr = addr.address
+
+                if ipv4_addr:  # 只返回有IP地址的接口
+                    best_rank = rank
+                    primary = {
+                        "name": interface_name,
+                        "ip_address": ipv4_addr,
+                        "mac_address": mac_addr,
+                        "is_up": interface_stats.isup,
+                        "speed": interface_stats.speed,
+                    }
+                    if rank == 0:
+                        break
+
+            if primary is not None:
+                return primary
 
             return {
                 "name": "None",
@@ -509,8 +627,8 @@ class SystemMonitor:
                 "speed": 0,
             }
 
-        except Exception:
-            self.logger.warning("获取主要网络接口失败: {e}")
+        except Exception as e:
+            self.logger.warning("获取主要网络接口失败: %s", e)
             return {
                 "name": "Error",
                 "ip_address": None,
@@ -529,10 +647,13 @@ class SystemMonitor:
             Dict[str, Any]: 电脑概况信息，包含用户友好的格式化数据
         """
         try:
-            # 获取基础数据
-            system_status = self.get_system_status()
-            hardware_info = self.get_hardware_info()
-            boot_time_info = self.get_boot_time()
+            # 并行获取基础数据
+            system_future = self._executor.submit(self.get_system_status)
+            hardware_future = self._executor.submit(self.get_hardware_info)
+            boot_time_future = self._executor.submit(self.get_boot_time)
+            system_status = system_future.result()
+            hardware_info = hardware_future.result()
+            boot_time_info = boot_time_future.result()
 
             # 检查是否有错误
             if "error" in system_status:
@@ -599,21 +720,15 @@ class SystemMonitor:
                     "overall": self._evaluate_system_status(
                         cpu_percent, memory_percent, disk_percent
                     ),
-                    "cpu_status": (
-                        "正常"
-                        if cpu_percent < 80
-                        else ("警告" if cpu_percent < 95 else "危险")
-                    ),
-                    "memory_status": (
-                        "正常"
-                        if memory_percent < 90
-                        else ("警告" if memory_percent < 95 else "危险")
-                    ),
-                    "disk_status": (
-                        "正常"
-                        if disk_percent < 90
-                        else ("警告" if disk_percent < 95 else "危险")
-                    ),
+                    "cpu_status": _USAGE_STATUS[
+                        (cpu_percent >= 80) + (cpu_percent >= 95)
+                    ],
+                    "memory_status": _USAGE_STATUS[
+                        (memory_percent >= 90) + (memory_percent >= 95)
+                    ],
+                    "disk_status": _USAGE_STATUS[
+                        (disk_percent >= 90) + (disk_percent >= 95)
+                    ],
                 },
             }
 
@@ -624,7 +739,7 @@ class SystemMonitor:
             }
 
         except Exception as e:
-            self.logger.error("获取电脑概况失败: {e}")
+            self.logger.error("获取电脑概况失败: %s", e)
             return {"error": str(e)}
 
     def get_network_info_simplified(
@@ -640,14 +755,20 @@ class SystemMonitor:
             Dict[str, Any]: 简化的网络信息
         """
         try:
-            # 获取完整网络信息
-            full_network_info = self.get_network_status()
+            # 网关探测与完整网络信息查询相互独立，并行执行
+            gateway_future = self._executor.submit(self._probe_dns_and_gateway)
+
+            # 接口地址和统计只获取一次，供完整网络信息和主要接口共用
+            if_addrs = psutil.net_if_addrs()
+            if_stats = psutil.net_if_stats()
+            full_network_info = self.get_network_status(if_addrs, if_stats)
+            dns_servers, gateway = gateway_future.result()
 
             if "error" in full_network_info:
                 return {"error": f"获取网络状态失败: {full_network_info['error']}"}
 
             # 获取主要网络接口
-            primary_interface = self._get_primary_network_interface()
+            primary_interface = self._get_primary_network_interface(if_addrs, if_stats)
 
             # 简化接口信息
             simplified_interfaces = []
@@ -663,16 +784,11 @@ class SystemMonitor:
                 stats = interface_data.get("stats", {})
 
                 # 判断接口类型
-                interface_type = "有线网络"
-                if any(
-                    wifi_keyword in interface_name.lower()
-                    for wifi_keyword in ["wi-fi", "wlan", "wireless"]
-                ):
-                    interface_type = "无线网络"
+                interface_type = self._get_interface_type(interface_name)
 
                 # 格式化速度
                 speed = stats.get("speed", 0)
-                speed_str = "{speed} Mbps" if speed > 0 else None
+                speed_str = f"{speed} Mbps" if speed > 0 else None
 
                 simplified_interfaces.append(
                     {
@@ -706,15 +822,10 @@ class SystemMonitor:
                         mac_addr = addr_info.get("address")
 
                 if ipv4_addr:  # 只添加有IP地址的接口
-                    interface_type = "有线网络"
-                    if any(
-                        wifi_keyword in interface_name.lower()
-                        for wifi_keyword in ["wi-fi", "wlan", "wireless"]
-                    ):
-                        interface_type = "无线网络"
+                    interface_type = self._get_interface_type(interface_name)
 
                     speed = stats.get("speed", 0)
-                    speed_str = "{speed} Mbps" if speed > 0 else None
+                    speed_str = f"{speed} Mbps" if speed > 0 else None
 
                     active_interfaces.append(
                         {
@@ -763,31 +874,6 @@ class SystemMonitor:
                 "packets_received": io_stats.get("packets_recv", 0),
             }
 
-            # 获取DNS服务器和网关信息（简化版）
-            dns_servers = []
-            gateway = None
-
-            # 尝试从系统获取DNS和网关信息
-            try:
-                import socket
-
-                # 获取默认网关（通过连接外部地址的方式）
-                with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
-                    s.connect(("8.8.8.8", 80))
-                    local_ip = s.getsockname()[0]
-                    # 简单推断网关地址（通常是网段的.1地址）
-                    ip_parts = local_ip.split(".")
-                    if len(ip_parts) == 4:
-                        gateway = "{ip_parts[0]}.{ip_parts[1]}.{ip_parts[2]}.1"
-
-                # 常见的DNS服务器
-                dns_servers = ["8.8.8.8", "8.8.4.4"]
-
-            except Exception:
-                # 如果获取失败，使用默认值
-                dns_servers = ["8.8.8.8", "8.8.4.4"]
-                gateway = "192.168.1.1"
-
             # 构建返回结果
             network_info = {
                 "status": {
@@ -825,9 +911,63 @@ class SystemMonitor:
             }
 
         except Exception as e:
-            self.logger.error("获取简化网络信息失败: {e}")
+            self.logger.error("获取简化网络信息失败: %s", e)
             return {"error": str(e)}
 
+    def _probe_dns_and_gateway(self) -> Tuple[List[str], Optional[str]]:
+        """获取DNS服务器和网关信息（简化版）"""
+        # 常见的DNS服务器
+        dns_servers = ["8.8.8.8", "8.8.4.4"]
+
+        # 网关很少变化，短时间内重复调用直接使用缓存
+        now = time.monotonic()
+        if (
+            self._gateway_cache is None
+            or now - self._gateway_cache[0] >= GATEWAY_CACHE_TTL
+        ):
+            self._gateway_cache = (now, self._discover_gateway())
+        return dns_servers, self._gateway_cache[1]
+
+    def _read_linux_default_gateway(self) -> Optional[str]:
+        """从/proc/net/route读取默认网关，非Linux系统或无默认路由时返回None"""
+        try:
+            with open("/proc/net/route", encoding="ascii") as f:
+                next(f, None)  # 跳过表头
+                for line in f:
+                    fields = line.split()
+                    # 字段：Iface Destination Gateway Flags ...，地址为小端十六进制
+                    if (
+                        len(fields) > 3
+                        and fields[1] == "00000000"
+                        and int(fields[3], 16) & _RTF_GATEWAY
+                    ):
+                        return socket.inet_ntoa(bytes.fromhex(fields[2])[::-1])
+        except (OSError, ValueError):
+            pass
+        return None
+
+    def _discover_gateway(self) -> Optional[str]:
+        """查找默认网关：优先读取系统路由表，否则按本机IP推断"""
+        gateway = self._read_linux_default_gateway()
+        if gateway:
+            return gateway
+
+        try:
+            # 获取默认网关（通过连接外部地址的方式，UDP connect不实际发送数据）
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+                s.connect(("8.8.8.8", 80))
+                local_ip = s.getsockname()[0]
+                # 简单推断网关地址（通常是网段的.1地址）
+                ip_parts = local_ip.split(".")
+                if len(ip_parts) == 4:
+                    gateway = f"{ip_parts[0]}.{ip_parts[1]}.{ip_parts[2]}.1"
+
+        except Exception:
+            # 如果获取失败，使用默认值
+            gateway = "192.168.1.1"
+
+        return gateway
+
     def get_development_environment_info(self) -> Dict[str, Any]:
         """
         获取开发环境信息（Python、Node.js等）
@@ -863,7 +1003,7 @@ class SystemMonitor:
                 if isinstance(python_info, dict) and "error" not in python_info:
                     dev_info["python"] = python_info
             except Exception as e:
-                self.logger.warning(f"获取Python信息失败，使用默认值: {e}")
+                self.logger.warning("获取Python信息失败，使用默认值: %s", e)
 
             # 安全获取Node.js信息
             try:
@@ -871,7 +1011,7 @@ class SystemMonitor:
                 if isinstance(nodejs_info, dict) and "error" not in nodejs_info:
                     dev_info["nodejs"] = nodejs_info
             except Exception as e:
-                self.logger.warning(f"获取Node.js信息失败，使用默认值: {e}")
+                self.logger.warning("获取Node.js信息失败，使用默认值: %s", e)
 
             result = {
                 "success": True,
@@ -885,7 +1025,7 @@ class SystemMonitor:
             return result
 
         except Exception as e:
-            self.logger.error(f"获取开发环境信息失败: {e}")
+            self.logger.error("获取开发环境信息失败: %s", e)
             # 返回默认结构而不是错误，确保不影响主要功能
             return {
                 "success": True,
@@ -908,9 +1048,9 @@ class SystemMonitor:
         """
         try:
             # 获取基本系统信息
-            system_info = platform.system()
-            hostname = platform.node()
-            processor = platform.processor()
+            system_info = self._platform_info["system"]
+            hostname = self._platform_info["hostname"]
+            processor = self._platform_info["processor"]
 
             # 获取基本CPU信息
             cpu_freq = None
@@ -979,7 +1119,7 @@ class SystemMonitor:
             }
 
         except Exception as e:
-            self.logger.error(f"获取基本系统信息失败: {e}")
+            self.logger.error("获取基本系统信息失败: %s", e)
             return {"error": str(e)}
 
     def _get_python_info(self) -> Dict[str, Any]:
@@ -1048,13 +1188,13 @@ class SystemMonitor:
                         pass
 
             except Exception as e:
-                self.logger.debug(f"获取Python信息时出错: {e}")
+                self.logger.debug("获取Python信息时出错: %s", e)
                 pass
 
             return python_info
 
         except Exception as e:
-            self.logger.warning(f"获取Python信息失败: {e}")
+            self.logger.warning("获取Python信息失败: %s", e)
             return {
                 "python": {
                     "system_python": None,
@@ -1120,11 +1260,11 @@ class SystemMonitor:
                         pass
 
             except Exception as e:
-                self.logger.debug(f"获取Node.js信息时出错: {e}")
+                self.logger.debug("获取Node.js信息时出错: %s", e)
                 pass
 
             return nodejs_info
 
         except Exception as e:
-            self.logger.warning(f"获取Node.js信息失败: {e}")
+            self.logger.warning("获取Node.js信息失败: %s", e)
             return {"node": None}
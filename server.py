@@ -94,6 +94,11 @@ class AIToolServer(FastMCP):
             await self.import_server(prefix="ps", server=self.powershell_service)
             self.logger.info("✓ PowerShell服务已整合")
 
+    def close(self):
+        """释放子服务持有的资源（线程池等）"""
+        if self.system_service:
+            self.system_service.close()
+
     async def get_service_info(self) -> Dict[str, Any]:
         """获取主服务器信息"""
         tools = await self.get_tools()
@@ -178,4 +183,7 @@ if __name__ == "__main__":
 
     # 直接运行服务器（不在事件循环中）
     print("正在启动MCP服务器...")
-    server.run()
+    try:
+        server.run()
+    finally:
+        server.close()
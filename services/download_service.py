@@ -99,15 +99,18 @@ class DownloadService(BaseService):
                     max_file_size,
                     check_file_type,
                     validate_image,
+                    max(1, min(max_concurrent, 50)),  # 并发数限制在1-50
                 )
 
                 # 格式化批量下载结果
                 summary = "批量下载完成:\n"
-                summary += "总计: {result['total']} 个文件\n"
-                summary += "成功: {result['success']} 个\n"
-                summary += "失败: {result['failed']} 个\n"
-                summary += "跳过: {result['skipped']} 个\n"
-                summary += "耗时: {result['duration']:.2f} 秒\n"
+                summary += f"总计: {result['total']} 个文件\n"
+                summary += f"成功: {result['success']} 个\n"
+                summary += f"失败: {result['failed']} 个\n"
+                summary += f"跳过: {result['skipped']} 个\n"
+                if result.get("duplicates"):
+                    summary += f"重复: {result['duplicates']} 个（已合并下载）\n"
+                summary += f"耗时: {result['duration']:.2f} 秒\n"
 
                 # 添加失败详情
                 failed_details = [
@@ -116,7 +119,7 @@ class DownloadService(BaseService):
                 if failed_details:
                     summary += "\n失败详情:\n"
                     for detail in failed_details[:5]:  # 只显示前5个失败
-                        summary += "- {detail['url']}: {detail['error']}\n"
+                        summary += f"- {detail['url']}: {detail['error']}\n"
 
                 return summary
             return "参数类型错误: urls和filenames必须都是字符串或都是列表"
@@ -139,7 +142,7 @@ class DownloadService(BaseService):
                 info = self.file_downloader.get_file_info(url, timeout)
 
             if "error" in info:
-                return "获取文件信息失败: {info['error']}"
+                return f"获取文件信息失败: {info['error']}"
 
             # 格式化输出
             result = "文件信息:\n"
@@ -160,8 +163,8 @@ class DownloadService(BaseService):
 
             # 图片特有信息
             if get_image_details and "width" in info:
-                result += "尺寸: {info['width']} x {info['height']}\n"
-                result += "格式: {info['format']}\n"
+                result += f"尺寸: {info['width']} x {info['height']}\n"
+                result += f"格式: {info['format']}\n"
 
             return result
 
@@ -174,7 +177,7 @@ class DownloadService(BaseService):
         """注册所有下载相关工具"""
 
         @self.tool()
-        def get(
+        async def get(
             urls: Annotated[
                 Union[str, List[str]],
                 Field(description="文件URL，可以是单个URL字符串或URL数组"),
@@ -220,7 +223,8 @@ class DownloadService(BaseService):
             if not is_valid:
                 return AbsolutePathValidator.format_error_message(target_dir, error_msg)
 
-            return self._download_files_impl(
+            return await self._run_sync(
+                self._download_files_impl,
                 urls,
                 filenames,
                 target_dir,
@@ -234,7 +238,7 @@ class DownloadService(BaseService):
             )
 
         @self.tool()
-        def info(
+        async def info(
             url: Annotated[str, Field(description="文件的URL地址")],
             timeout: Annotated[
                 int, Field(description="请求超时时间，单位秒，范围1-300")
@@ -244,7 +248,9 @@ class DownloadService(BaseService):
             ] = False,
         ) -> str:
             """获取文件基本信息"""
-            return self._get_file_info_impl(url, timeout, get_image_details)
+            return await self._run_sync(
+                self._get_file_info_impl, url, timeout, get_image_details
+            )
 
 
 if __name__ == "__main__":
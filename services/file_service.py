@@ -6,7 +6,7 @@ File operation MCP service
 """
 
 import asyncio
-from typing import Annotated, Any, Dict, List, Union
+from typing import Annotated, Any, Callable, Dict, List, Optional, Tuple, Union
 
 from pydantic import Field
 
@@ -150,45 +150,22 @@ class FileService(BaseService):
             # 统一处理为列表
             paths = [dir_paths] if isinstance(dir_paths, str) else dir_paths
 
-            # 验证所有路径
-            results = []
+            # 先验证所有路径，再批量执行
+            jobs = []
             for path in paths:
                 is_valid, error_msg = AbsolutePathValidator.validate_path(path)
-                if not is_valid:
-                    results.append({"path": path, "success": False, "error": error_msg})
-                else:
-                    try:
-                        result = await self._run_sync(
-                            self.file_option.create_directory, path
-                        )
-                        if result.get("success", True):
-                            results.append(
-                                {
-                                    "path": path,
-                                    "success": True,
-                                    "message": f"目录创建成功: {path}",
-                                }
-                            )
-                        else:
-                            results.append(
-                                {
-                                    "path": path,
-                                    "success": False,
-                                    "error": result.get("error", "创建失败"),
-                                }
-                            )
-                    except Exception as e:
-                        results.append(
-                            {"path": path, "success": False, "error": str(e)}
-                        )
-
-            success_count = sum(1 for r in results if r["success"])
-            return {
-                "total": len(paths),
-                "success_count": success_count,
-                "failed_count": len(paths) - success_count,
-                "results": results,
-            }
+                jobs.append(
+                    (
+                        {"path": path},
+                        None if is_valid else error_msg,
+                        (path,),
+                        f"目录创建成功: {path}",
+                    )
+                )
+
+            return await self._run_batch(
+                self.file_option.create_directory, jobs, "创建失败"
+            )
 
         @self.tool()
         async def rmdir(
@@ -209,45 +186,22 @@ class FileService(BaseService):
             # 统一处理为列表
             paths = [dir_paths] if isinstance(dir_paths, str) else dir_paths
 
-            # 验证所有路径
-            results = []
+            # 先验证所有路径，再批量执行
+            jobs = []
             for path in paths:
                 is_valid, error_msg = AbsolutePathValidator.validate_path(path)
-                if not is_valid:
-                    results.append({"path": path, "success": False, "error": error_msg})
-                else:
-                    try:
-                        result = await self._run_sync(
-                            self.file_option.delete_directory, path, force
-                        )
-                        if result.get("success", True):
-                            results.append(
-                                {
-                                    "path": path,
-                                    "success": True,
-                                    "message": f"目录删除成功: {path}",
-                                }
-                            )
-                        else:
-                            results.append(
-                                {
-                                    "path": path,
-                                    "success": False,
-                                    "error": result.get("error", "删除失败"),
-                                }
-                            )
-                    except Exception as e:
-                        results.append(
-                            {"path": path, "success": False, "error": str(e)}
-                        )
-
-            success_count = sum(1 for r in results if r["success"])
-            return {
-                "total": len(paths),
-                "success_count": success_count,
-                "failed_count": len(paths) - success_count,
-                "results": results,
-            }
+                jobs.append(
+                    (
+                        {"path": path},
+                        None if is_valid else error_msg,
+                        (path, force),
+                        f"目录删除成功: {path}",
+                    )
+                )
+
+            return await self._run_batch(
+                self.file_option.delete_directory, jobs, "删除失败"
+            )
 
         @self.tool()
         async def ls(
@@ -297,77 +251,21 @@ class FileService(BaseService):
             # 统一处理为列表
             ops = [operations] if isinstance(operations, dict) else operations
 
-            results = []
+            # 先验证所有源路径和目标路径，再批量执行
+            jobs = []
             for op in ops:
                 source = op.get("source")
                 dest = op.get("dest")
-
-                # 验证源路径
-                is_valid, error_msg = AbsolutePathValidator.validate_path(source)
-                if not is_valid:
-                    results.append(
-                        {
-                            "source": source,
-                            "dest": dest,
-                            "success": False,
-                            "error": f"源路径错误: {error_msg}",
-                        }
+                jobs.append(
+                    (
+                        {"source": source, "dest": dest},
+                        self._validate_transfer_paths(source, dest),
+                        (source, dest),
+                        f"文件复制成功: {source} -> {dest}",
                     )
-                    continue
-
-                # 验证目标路径
-                is_valid, error_msg = AbsolutePathValidator.validate_path(dest)
-                if not is_valid:
-                    results.append(
-                        {
-                            "source": source,
-                            "dest": dest,
-                            "success": False,
-                            "error": f"目标路径错误: {error_msg}",
-                        }
-                    )
-                    continue
+                )
 
-                # 执行复制
-                try:
-                    result = await self._run_sync(
-                        self.file_option.copy_file, source, dest
-                    )
-                    if result.get("success", True):
-                        results.append(
-                            {
-                                "source": source,
-                                "dest": dest,
-                                "success": True,
-                                "message": f"文件复制成功: {source} -> {dest}",
-                            }
-                        )
-                    else:
-                        results.append(
-                            {
-                                "source": source,
-                                "dest": dest,
-                                "success": False,
-                                "error": result.get("error", "复制失败"),
-                            }
-                        )
-                except Exception as e:
-                    results.append(
-                        {
-                            "source": source,
-                            "dest": dest,
-                            "success": False,
-                            "error": str(e),
-                        }
-                    )
-
-            success_count = sum(1 for r in results if r["success"])
-            return {
-                "total": len(ops),
-                "success_count": success_count,
-                "failed_count": len(ops) - success_count,
-                "results": results,
-            }
+            return await self._run_batch(self.file_option.copy_file, jobs, "复制失败")
 
         @self.tool()
         async def move(
@@ -390,77 +288,21 @@ class FileService(BaseService):
             # 统一处理为列表
             ops = [operations] if isinstance(operations, dict) else operations
 
-            results = []
+            # 先验证所有源路径和目标路径，再批量执行
+            jobs = []
             for op in ops:
                 source = op.get("source")
                 dest = op.get("dest")
-
-                # 验证源路径
-                is_valid, error_msg = AbsolutePathValidator.validate_path(source)
-                if not is_valid:
-                    results.append(
-                        {
-                            "source": source,
-                            "dest": dest,
-                            "success": False,
-                            "error": f"源路径错误: {error_msg}",
-                        }
-                    )
-                    continue
-
-                # 验证目标路径
-                is_valid, error_msg = AbsolutePathValidator.validate_path(dest)
-                if not is_valid:
-                    results.append(
-                        {
-                            "source": source,
-                            "dest": dest,
-                            "success": False,
-                            "error": f"目标路径错误: {error_msg}",
-                        }
+                jobs.append(
+                    (
+                        {"source": source, "dest": dest},
+                        self._validate_transfer_paths(source, dest),
+                        (source, dest),
+                        f"文件移动成功: {source} -> {dest}",
                     )
-                    continue
+                )
 
-                # 执行移动
-                try:
-                    result = await self._run_sync(
-                        self.file_option.move_file, source, dest
-                    )
-                    if result.get("success", True):
-                        results.append(
-                            {
-                                "source": source,
-                                "dest": dest,
-                                "success": True,
-                                "message": f"文件移动成功: {source} -> {dest}",
-                            }
-                        )
-                    else:
-                        results.append(
-                            {
-                                "source": source,
-                                "dest": dest,
-                                "success": False,
-                                "error": result.get("error", "移动失败"),
-                            }
-                        )
-                except Exception as e:
-                    results.append(
-                        {
-                            "source": source,
-                            "dest": dest,
-                            "success": False,
-                            "error": str(e),
-                        }
-                    )
-
-            success_count = sum(1 for r in results if r["success"])
-            return {
-                "total": len(ops),
-                "success_count": success_count,
-                "failed_count": len(ops) - success_count,
-                "results": results,
-            }
+            return await self._run_batch(self.file_option.move_file, jobs, "移动失败")
 
         @self.tool()
         async def delete(
@@ -480,45 +322,20 @@ class FileService(BaseService):
             # 统一处理为列表
             paths = [file_paths] if isinstance(file_paths, str) else file_paths
 
-            # 验证所有路径
-            results = []
+            # 先验证所有路径，再批量执行
+            jobs = []
             for path in paths:
                 is_valid, error_msg = AbsolutePathValidator.validate_path(path)
-                if not is_valid:
-                    results.append({"path": path, "success": False, "error": error_msg})
-                else:
-                    try:
-                        result = await self._run_sync(
-                            self.file_option.delete_file, path
-                        )
-                        if result.get("success", True):
-                            results.append(
-                                {
-                                    "path": path,
-                                    "success": True,
-                                    "message": f"文件删除成功: {path}",
-                                }
-                            )
-                        else:
-                            results.append(
-                                {
-                                    "path": path,
-                                    "success": False,
-                                    "error": result.get("error", "删除失败"),
-                                }
-                            )
-                    except Exception as e:
-                        results.append(
-                            {"path": path, "success": False, "error": str(e)}
-                        )
-
-            success_count = sum(1 for r in results if r["success"])
-            return {
-                "total": len(paths),
-                "success_count": success_count,
-                "failed_count": len(paths) - success_count,
-                "results": results,
-            }
+                jobs.append(
+                    (
+                        {"path": path},
+                        None if is_valid else error_msg,
+                        (path,),
+                        f"文件删除成功: {path}",
+                    )
+                )
+
+            return await self._run_batch(self.file_option.delete_file, jobs, "删除失败")
 
         @self.tool()
         async def info(
@@ -561,64 +378,87 @@ class FileService(BaseService):
             # 统一处理为列表
             ops = [operations] if isinstance(operations, dict) else operations
 
-            results = []
+            # 先验证所有路径，再批量执行
+            jobs = []
             for op in ops:
                 file_path = op.get("path")
                 mode = op.get("mode")
-
-                # 验证路径
                 is_valid, error_msg = AbsolutePathValidator.validate_path(file_path)
-                if not is_valid:
-                    results.append(
-                        {
-                            "path": file_path,
-                            "mode": mode,
-                            "success": False,
-                            "error": f"路径错误: {error_msg}",
-                        }
+                jobs.append(
+                    (
+                        {"path": file_path, "mode": mode},
+                        None if is_valid else f"路径错误: {error_msg}",
+                        (file_path, mode),
+                        f"权限修改成功: {file_path} -> {mode}",
                     )
-                    continue
+                )
 
-                # 执行权限修改
-                try:
-                    result = await self._run_sync(
-                        self.file_option.change_file_permissions, file_path, mode
-                    )
-                    if result.get("success", True):
-                        results.append(
-                            {
-                                "path": file_path,
-                                "mode": mode,
-                                "success": True,
-                                "message": f"权限修改成功: {file_path} -> {mode}",
-                            }
-                        )
-                    else:
-                        results.append(
-                            {
-                                "path": file_path,
-                                "mode": mode,
-                                "success": False,
-                                "error": result.get("error", "权限修改失败"),
-                            }
-                        )
-                except Exception as e:
-                    results.append(
-                        {
-                            "path": file_path,
-                            "mode": mode,
-                            "success": False,
-                            "error": str(e),
-                        }
-                    )
+            return await self._run_batch(
+                self.file_option.change_file_permissions, jobs, "权限修改失败"
+            )
 
-            success_count = sum(1 for r in results if r["success"])
-            return {
-                "total": len(ops),
-                "success_count": success_count,
-                "failed_count": len(ops) - success_count,
-                "results": results,
-            }
+    @staticmethod
+    def _validate_transfer_paths(source: str, dest: str) -> Optional[str]:
+        """验证复制/移动操作的源路径和目标路径，返回错误消息（通过时为None）"""
+        is_valid, error_msg = AbsolutePathValidator.validate_path(source)
+        if not is_valid:
+            return f"源路径错误: {error_msg}"
+        is_valid, error_msg = AbsolutePathValidator.validate_path(dest)
+        if not is_valid:
+            return f"目标路径错误: {error_msg}"
+        return None
+
+    @staticmethod
+    def _apply_each(func: Callable[..., Any], arg_list: List[tuple]) -> List[Any]:
+        """依次执行同一操作，单项异常作为结果返回，不影响其余操作"""
+        outcomes = []
+        for args in arg_list:
+            try:
+                outcomes.append(func(*args))
+            except Exception as e:
+                outcomes.append(e)
+        return outcomes
+
+    async def _run_batch(
+        self,
+        func: Callable[..., Dict[str, Any]],
+        jobs: List[Tuple[Dict[str, Any], Optional[str], tuple, str]],
+        default_error: str,
+    ) -> Dict[str, Any]:
+        """
+        批量执行文件操作并汇总结果
+
+        jobs中每项为(结果标识字段, 验证错误或None, 操作参数, 成功消息)，
+        通过验证的操作在一次线程池调用中依次执行，结果保持原有顺序
+        """
+        arg_list = [args for _, error, args, _ in jobs if error is None]
+        outcomes = await self._run_sync(self._apply_each, func, arg_list)
+        if not isinstance(outcomes, list):
+            # 线程池调度本身失败时，所有待执行操作均视为失败
+            outcomes = [RuntimeError(outcomes["error"])] * len(arg_list)
+        pending = iter(outcomes)
+
+        results = []
+        for fields, error, _, success_message in jobs:
+            if error is None:
+                outcome = next(pending)
+                if isinstance(outcome, Exception):
+                    error = str(outcome)
+                elif not outcome.get("success", True):
+                    error = outcome.get("error", default_error)
+
+            if error is None:
+                results.append({**fields, "success": True, "message": success_message})
+            else:
+                results.append({**fields, "success": False, "error": error})
+
+        success_count = sum(1 for r in results if r["success"])
+        return {
+            "total": len(jobs),
+            "success_count": success_count,
+            "failed_count": len(jobs) - success_count,
+            "results": results,
+        }
 
     async def get_service_info(self) -> Dict[str, Any]:
         """Get service information"""
@@ -118,6 +118,10 @@ class SystemService(BaseService):
                 self.logger.error("Get basic system info failed: {e}")
                 return {"error": str(e)}
 
+    def close(self) -> None:
+        """Release resources held by the system monitor"""
+        self.system_monitor.close()
+
     async def get_service_info(self) -> Dict[str, Any]:
         """Get service information"""
         base_info = await super().get_service_info()
@@ -143,4 +147,6 @@ if __name__ == "__main__":
         tools = await service.get_tools()
         print(f"Available tools: {list(tools.keys())}")
 
+        service.close()
+
     asyncio.run(main())